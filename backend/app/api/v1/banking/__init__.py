@@ -3,7 +3,10 @@ Banking API Module - Single User System
 Combines all banking-related endpoints under /api/v1/banking/
 """
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
+
+from app.core.responses import ORJSONResponse
 from . import (
     accounts,
     categories,
@@ -14,7 +17,11 @@ from . import (
 )
 
 # Create main banking router
-router = APIRouter(prefix="/api/v1/banking", tags=["banking"])
+router = APIRouter(
+    prefix="/api/v1/banking",
+    tags=["banking"],
+    default_response_class=ORJSONResponse
+)
 
 # Include all sub-routers (production endpoints only)
 router.include_router(finance.router)  # Dashboard, transactions, budget, cumulative-spending
@@ -24,17 +31,20 @@ router.include_router(transactions.router, prefix="/transactions", tags=["transa
 router.include_router(process.router, prefix="/process", tags=["process"])
 router.include_router(settings.router, prefix="/settings", tags=["settings"])
 
+# Health payload is constant, so encode it once at import
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "module": "banking",
+    "services": {
+        "classifier": "ready",
+        "parser": "ready",
+        "tagger": "ready",
+        "uploader": "ready"
+    }
+})
+
 # Health check endpoint for banking module
 @router.get("/health")
 async def banking_health():
     """Check if banking module is healthy"""
-    return {
-        "status": "healthy",
-        "module": "banking",
-        "services": {
-            "classifier": "ready",
-            "parser": "ready",
-            "tagger": "ready",
-            "uploader": "ready"
-        }
-    }
+    return Response(_HEALTH_BYTES, media_type="application/json")
@@ -2,24 +2,36 @@
 Finance Manager - Accounts API Endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-import uuid
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import bindparam, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import orjson
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.auth import get_current_user
+from app.core.dataloader import AccountLoader, get_account_loader
 from app.models.user import User
 from app.models.account import Account
-from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, AccountSummary
+from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, AccountSummary, AccountPage
 
 router = APIRouter()
 
+_STATUS_BYTES = orjson.dumps({"status": "available"})
+
+# Fixed-shape statements: compiled once and reused via lambda_stmt's cache
+_SOFT_DELETE_ACCOUNT = lambda_stmt(
+    lambda: update(Account)
+    .where(Account.id == bindparam("aid"), Account.user_id == bindparam("uid"))
+    .values(is_active=False)
+    .returning(Account.id)
+)
+
 
 @router.post("/", response_model=AccountResponse)
 async def create_account(
     account: AccountCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new account for the current user."""
@@ -33,13 +45,12 @@ async def create_account(
         credit_limit=account.credit_limit
     )
     db.add(db_account)
-    db.commit()
-    db.refresh(db_account)
+    await db.commit()
+    await db.refresh(db_account)
     
-    # Convert UUID to string for JSON response
-    response_data = AccountResponse(
-        id=str(db_account.id),
-        user_id=str(db_account.user_id),
+    response_data = AccountResponse.model_construct(
+        id=db_account.id,
+        user_id=db_account.user_id,
         name=db_account.name,
         account_type=db_account.account_type,
         account_number=db_account.account_number,
@@ -53,46 +64,62 @@ async def create_account(
     return response_data
 
 
-@router.get("/", response_model=List[AccountSummary])
+@router.get("/", response_model=AccountPage)
 async def get_accounts(
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of accounts to return"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all accounts for the current user."""
-    accounts = db.query(Account).filter(Account.user_id == current_user.id).all()
+    """Get the current user's accounts, one keyset page at a time (ordered by id)."""
+    # Project only the summary columns: no ORM hydration or identity-map tracking
+    query = select(
+        Account.id,
+        Account.name,
+        Account.account_type,
+        Account.balance,
+        Account.is_active
+    ).where(Account.user_id == current_user.id)
     
-    # Convert UUID to string for JSON response
-    response_data = []
-    for account in accounts:
-        response_data.append(AccountSummary(
-            id=str(account.id),
-            name=account.name,
-            account_type=account.account_type,
-            balance=account.balance,
-            is_active=account.is_active
-        ))
-    return response_data
+    # Keyset pagination: seek past the cursor instead of OFFSET scanning
+    if cursor is not None:
+        query = query.where(Account.id > cursor)
+    
+    rows = (await db.execute(query.order_by(Account.id).limit(limit))).all()
+    
+    # Rows come straight from typed DB columns, so skip validation
+    items = [
+        AccountSummary.model_construct(
+            id=row.id,
+            name=row.name,
+            account_type=row.account_type,
+            balance=row.balance,
+            is_active=row.is_active
+        )
+        for row in rows
+    ]
+    return AccountPage.model_construct(
+        items=items,
+        next_cursor=rows[-1].id if len(rows) == limit else None
+    )
+
+
+@router.get("/status")
+async def accounts_status():
+    """Account service status check."""
+    # Declared before /{account_id} so "status" is not parsed as an id
+    return Response(_STATUS_BYTES, media_type="application/json")
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
 async def get_account(
-    account_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    account_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+    account_loader: AccountLoader = Depends(get_account_loader)
 ):
     """Get a specific account by ID."""
-    try:
-        account_uuid = uuid.UUID(account_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid account ID format"
-        )
-    
-    account = db.query(Account).filter(
-        Account.id == account_uuid,
-        Account.user_id == current_user.id
-    ).first()
+    account = await account_loader.load(account_id)
     
     if not account:
         raise HTTPException(
@@ -100,10 +127,9 @@ async def get_account(
             detail="Account not found"
         )
     
-    # Convert UUID to string for JSON response
-    response_data = AccountResponse(
-        id=str(account.id),
-        user_id=str(account.user_id),
+    response_data = AccountResponse.model_construct(
+        id=account.id,
+        user_id=account.user_id,
         name=account.name,
         account_type=account.account_type,
         account_number=account.account_number,
@@ -119,24 +145,26 @@ async def get_account(
 
 @router.put("/{account_id}", response_model=AccountResponse)
 async def update_account(
-    account_id: str,
+    account_id: int,
     account_update: AccountUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+    account_loader: AccountLoader = Depends(get_account_loader)
 ):
     """Update an existing account."""
-    try:
-        account_uuid = uuid.UUID(account_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid account ID format"
-        )
+    update_data = account_update.dict(exclude_unset=True)
     
-    account = db.query(Account).filter(
-        Account.id == account_uuid,
-        Account.user_id == current_user.id
-    ).first()
+    if update_data:
+        # Single UPDATE ... RETURNING instead of SELECT + dirty-tracking + refresh
+        account = (await db.execute(
+            update(Account)
+            .where(Account.id == account_id, Account.user_id == current_user.id)
+            .values(**update_data)
+            .returning(Account)
+        )).scalar_one_or_none()
+        await db.commit()
+    else:
+        account = await account_loader.load(account_id)
     
     if not account:
         raise HTTPException(
@@ -144,18 +172,9 @@ async def update_account(
             detail="Account not found"
         )
     
-    # Update fields if provided
-    update_data = account_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(account, field, value)
-    
-    db.commit()
-    db.refresh(account)
-    
-    # Convert UUID to string for JSON response
-    response_data = AccountResponse(
-        id=str(account.id),
-        user_id=str(account.user_id),
+    response_data = AccountResponse.model_construct(
+        id=account.id,
+        user_id=account.user_id,
         name=account.name,
         account_type=account.account_type,
         account_number=account.account_number,
@@ -171,38 +190,23 @@ async def update_account(
 
 @router.delete("/{account_id}")
 async def delete_account(
-    account_id: str,
-    db: Session = Depends(get_db),
+    account_id: int,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an account (soft delete by setting is_active to False)."""
-    try:
-        account_uuid = uuid.UUID(account_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid account ID format"
-        )
-    
-    account = db.query(Account).filter(
-        Account.id == account_uuid,
-        Account.user_id == current_user.id
-    ).first()
+    # Soft delete in one round-trip; RETURNING tells us whether the account existed
+    result = await db.execute(
+        _SOFT_DELETE_ACCOUNT, {"aid": account_id, "uid": current_user.id}
+    )
+    deleted_id = result.scalar_one_or_none()
+    await db.commit()
     
-    if not account:
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Account not found"
         )
     
-    # Soft delete by setting is_active to False
-    account.is_active = False
-    db.commit()
-    
     return {"message": "Account deleted successfully"}
 
-
-@router.get("/status")
-async def accounts_status():
-    """Account service status check."""
-    return {"status": "available"}
@@ -2,69 +2,194 @@
 Finance Manager - Categories API Endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
+from sqlalchemy import bindparam, lambda_stmt, select, func, desc, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from typing import Optional, Dict, Any
+from cachetools import TTLCache
+from contextvars import ContextVar
+import functools
+import orjson
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.data_version import current_finance_data_version
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.category import Category
-from app.models.transaction import Transaction
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryPage
 
 router = APIRouter()
 
+# Redis cache namespaces (cleared whenever categories change)
+CATEGORIES_CACHE_NAMESPACE = "cats"
+CATEGORY_STATS_CACHE_NAMESPACE = "cat_stats"
 
-@router.get("/", response_model=List[CategoryResponse])
+# Per-process L1 in front of Redis: encoded category list bodies keyed by
+# (user_id, category_type, search, limit, cursor, finance_data_version).
+# invalidate_category_cache() only clears the worker that handled the write;
+# the data version in the key is what keeps the other workers' copies from
+# being served after a write.
+_categories_local_cache = TTLCache(maxsize=1024, ttl=30)
+
+# Data version local_categories_cache read for the current request, handed
+# to categories_key_builder so the L1 and Redis keys can't straddle a bump
+_request_data_version: ContextVar[Optional[int]] = ContextVar("category_request_data_version", default=None)
+
+_STATUS_BYTES = orjson.dumps({"status": "available"})
+
+# Fixed-shape statement: compiled once and reused via lambda_stmt's cache
+_ACTIVE_CATEGORY_BY_NAME = lambda_stmt(
+    lambda: select(Category)
+    .where(Category.name == bindparam("name"), Category.is_active == True)
+    .limit(1)
+)
+
+
+# Keys start with "{prefix}:{namespace}:" like fastapi-cache's default
+# builder, since FastAPICache.clear(namespace=...) only matches that form.
+# They also embed the finance data version (in memory, no I/O), so writes
+# that never call invalidate_category_cache() (tag edits in settings, CSV
+# uploads, transaction recategorization) still move readers onto fresh keys.
+def categories_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """Cache key for the category list, scoped to the user, filter arguments and data version."""
+    kwargs = kwargs or {}
+    version = _request_data_version.get()
+    if version is None:
+        version = current_finance_data_version()
+    return (
+        f"{FastAPICache.get_prefix()}:{namespace}:{kwargs['current_user'].id}"
+        f":{kwargs.get('category_type')}:{kwargs.get('search')}:{kwargs.get('limit')}:{kwargs.get('cursor')}"
+        f":{version}"
+    )
+
+
+def category_stats_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """Cache key for category stats, scoped to the user and data version."""
+    kwargs = kwargs or {}
+    return f"{FastAPICache.get_prefix()}:{namespace}:{kwargs['current_user'].id}:{current_finance_data_version()}"
+
+
+def local_categories_cache(func):
+    """
+    Serve get_categories from the in-process cache, falling back to Redis/DB.
+    The data version is read once per request and reused for the Redis key.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        version = current_finance_data_version()
+        key = (
+            kwargs['current_user'].id,
+            kwargs.get('category_type'),
+            kwargs.get('search'),
+            kwargs.get('limit'),
+            kwargs.get('cursor'),
+            version
+        )
+        body = _categories_local_cache.get(key)
+        if body is None:
+            token = _request_data_version.set(version)
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                _request_data_version.reset(token)
+            if isinstance(result, Response):
+                # e.g. a 304 from the Redis layer
+                return result
+            body = orjson.dumps(jsonable_encoder(result))
+            _categories_local_cache[key] = body
+        return Response(body, media_type="application/json")
+    return wrapper
+
+
+def category_cursor(category: Category) -> str:
+    """Opaque next_cursor for the category list: "<id>:<name>" of the page's last row."""
+    return f"{category.id}:{category.name}"
+
+
+def parse_category_cursor(cursor: str):
+    """Split a category_cursor() value back into (name, id); 400 if malformed."""
+    category_id, sep, name = cursor.partition(":")
+    if not sep or not category_id.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return name, int(category_id)
+
+
+async def invalidate_category_cache():
+    """Drop cached category lists and stats after a write."""
+    _categories_local_cache.clear()
+    await FastAPICache.clear(namespace=CATEGORIES_CACHE_NAMESPACE)
+    await FastAPICache.clear(namespace=CATEGORY_STATS_CACHE_NAMESPACE)
+
+
+@router.get("/", response_model=CategoryPage)
+@local_categories_cache
+@cache(expire=60, namespace=CATEGORIES_CACHE_NAMESPACE, key_builder=categories_key_builder)
 async def get_categories(
     category_type: Optional[str] = Query(None, description="Filter by category type (income/expense)"),
     search: Optional[str] = Query(None, description="Search categories by name"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of categories to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all categories for the current user with optional filtering."""
-    query = db.query(Category).filter(Category.is_active == True)
+    """Get categories with optional filtering, one keyset page at a time (ordered by name)."""
+    # CategoryResponse only reads columns; any relationship access during
+    # serialization would be an N+1, so make it fail loudly instead
+    query = select(Category).options(raiseload('*')).where(Category.is_active == True)
     
     # Apply filters
     if category_type:
-        query = query.filter(Category.category_type == category_type.lower())
+        query = query.where(Category.category_type == category_type.lower())
     
     if search:
-        query = query.filter(Category.name.ilike(f"%{search}%"))
+        query = query.where(Category.name.ilike(f"%{search}%"))
     
-    # Order by name
-    categories = query.order_by(Category.name).all()
+    # Keyset pagination: seek past the cursor instead of OFFSET scanning.
+    # Names are not unique, so the id breaks ties between equal names
+    if cursor is not None:
+        cursor_name, cursor_id = parse_category_cursor(cursor)
+        query = query.where(tuple_(Category.name, Category.id) > tuple_(cursor_name, cursor_id))
     
-    return [
-        CategoryResponse(
-            id=str(category.id),
+    categories = (await db.scalars(query.order_by(Category.name, Category.id).limit(limit))).all()
+    
+    items = [
+        CategoryResponse.model_construct(
+            id=category.id,
             name=category.name,
             description=category.description,
             category_type=category.category_type,
-            parent_id=str(category.parent_id) if category.parent_id else None,
+            parent_id=category.parent_id,
             is_active=category.is_active,
             created_at=category.created_at,
             updated_at=category.updated_at
         )
         for category in categories
     ]
+    return CategoryPage.model_construct(
+        items=items,
+        next_cursor=category_cursor(categories[-1]) if len(categories) == limit else None
+    )
 
 
 @router.post("/", response_model=CategoryResponse)
 async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new category."""
     # Check if category name already exists
-    existing_category = db.query(Category).filter(
-        Category.name == category.name,
-        Category.is_active == True
-    ).first()
+    existing_category = await db.scalar(
+        _ACTIVE_CATEGORY_BY_NAME, {"name": category.name}
+    )
     
     if existing_category:
         raise HTTPException(
@@ -81,15 +206,17 @@ async def create_category(
     )
     
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await db.refresh(db_category)
+    
+    await invalidate_category_cache()
     
-    return CategoryResponse(
-        id=str(db_category.id),
+    return CategoryResponse.model_construct(
+        id=db_category.id,
         name=db_category.name,
         description=db_category.description,
         category_type=db_category.category_type,
-        parent_id=str(db_category.parent_id) if db_category.parent_id else None,
+        parent_id=db_category.parent_id,
         is_active=db_category.is_active,
         created_at=db_category.created_at,
         updated_at=db_category.updated_at
@@ -97,46 +224,55 @@ async def create_category(
 
 
 @router.get("/stats/summary", response_model=Dict[str, Any])
+@cache(expire=300, namespace=CATEGORY_STATS_CACHE_NAMESPACE, key_builder=category_stats_key_builder)
 async def get_category_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get category statistics and transaction counts."""
     
-    # Get categories with transaction counts
-    category_stats = db.query(
-        Category.id,
-        Category.name,
-        Category.category_type,
-        func.count(Transaction.id).label('transaction_count'),
-        func.sum(Transaction.amount).label('total_amount')
-    ).outerjoin(Transaction, Category.id == Transaction.category_id)\
-     .filter(Category.is_active == True)\
-     .group_by(Category.id, Category.name, Category.category_type)\
-     .order_by(desc('transaction_count'))\
-     .all()
+    # Per-category transaction counts come from the category_stats_mv
+    # materialized view; category_stats_fresh() refreshes it first if a write
+    # to transactions/categories is newer than its last refresh
+    category_stats_rows = func.category_stats_fresh().table_valued(
+        'id', 'name', 'category_type', 'transaction_count', 'total_amount'
+    ).render_derived('category_stats')
     
-    # Calculate totals
-    total_categories = db.query(Category).filter(Category.is_active == True).count()
-    income_categories = db.query(Category).filter(
-        Category.is_active == True,
-        Category.category_type == 'income'
-    ).count()
-    expense_categories = db.query(Category).filter(
-        Category.is_active == True,
-        Category.category_type == 'expense'
-    ).count()
+    # Category totals ride along as window aggregates over the same rows,
+    # so the whole endpoint is a single round-trip
+    result = await db.execute(
+        select(
+            *category_stats_rows.c,
+            func.count().over().label('total_categories'),
+            func.count().filter(category_stats_rows.c.category_type == 'income').over().label('income_categories'),
+            func.count().filter(category_stats_rows.c.category_type == 'expense').over().label('expense_categories')
+        ).order_by(desc(category_stats_rows.c.transaction_count))
+    )
+    category_stats = result.all()
+    # category_stats_fresh() may have refreshed the view and recorded its
+    # refreshed_seq; commit so that work is kept (get_async_db never commits,
+    # and a rollback would leave the view stale and refreshed again on every miss)
+    await db.commit()
+    
+    # Totals are identical on every row; no rows means no active categories
+    if category_stats:
+        total_categories = category_stats[0].total_categories
+        income_categories = category_stats[0].income_categories
+        expense_categories = category_stats[0].expense_categories
+    else:
+        total_categories = income_categories = expense_categories = 0
     
-    # Format category stats
-    categories_with_stats = []
-    for stat in category_stats:
-        categories_with_stats.append({
-            "id": str(stat.id),
+    # Format category stats (ids are already ints; no per-row conversion needed)
+    categories_with_stats = [
+        {
+            "id": stat.id,
             "name": stat.name,
             "category_type": stat.category_type,
             "transaction_count": stat.transaction_count or 0,
             "total_amount": float(stat.total_amount) if stat.total_amount else 0.0
-        })
+        }
+        for stat in category_stats
+    ]
     
     return {
         "total_categories": total_categories,
@@ -148,4 +284,4 @@ async def get_category_stats(
 
 @router.get("/status")
 async def categories_status():
-    return {"status": "available"}
+    return Response(_STATUS_BYTES, media_type="application/json")
@@ -5,23 +5,52 @@ Core endpoints for financial data, dashboard metrics, and budget analysis.
 """
 
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, extract, case
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, and_, or_, extract, case, cast, literal_column, true, Float
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, date, timedelta
 from decimal import Decimal
+import asyncio
 import calendar
+import functools
 
-from app.core.database import get_async_db
+import numpy as np
+
+from app.core.database import get_async_db, execute_in_new_session
+from app.core.data_version import current_finance_data_version
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.models.category import Category
 from app.models.budget import Budget
+from app.models.transaction_daily_summary import TransactionDailySummary
 from app.core.constants import SINGLE_USER_ID
+from app.core.responses import ORJSONResponse
 
 router = APIRouter(tags=["Finance Data"])
 
+# Redis response cache for the read-heavy finance endpoints. Keys embed the
+# finance data version (moved by every committed write), so writes never need
+# to purge it.
+FINANCE_CACHE_NAMESPACE = "finance"
+FINANCE_CACHE_TTL = 300
+
+
+def finance_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """
+    Cache key for a finance endpoint: period arguments, today's date (relative
+    periods such as this_month move with it) and the current data version.
+    Starts with "{prefix}:{namespace}:" so FastAPICache.clear(namespace=...) matches it.
+    """
+    kwargs = kwargs or {}
+    return (
+        f"{FastAPICache.get_prefix()}:{namespace}:{func.__name__}:{SINGLE_USER_ID}:{kwargs.get('period')}"
+        f":{kwargs.get('start_date')}:{kwargs.get('end_date')}:{date.today().isoformat()}"
+        f":{current_finance_data_version()}"
+    )
+
 
 def get_month_date_range(year: int, month: int) -> Tuple[date, date]:
     """
@@ -42,144 +71,210 @@ def get_month_date_range(year: int, month: int) -> Tuple[date, date]:
     return first_day, last_day
 
 
-@router.get("/dashboard")
-async def get_dashboard_metrics(
-    period: str = Query("this_month", description="Period for metrics"),
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: AsyncSession = Depends(get_async_db)
-) -> Dict[str, Any]:
-    """Get real dashboard metrics from database"""
-    
-    # Determine date range using bulletproof month boundary calculation
-    today = date.today()
+@functools.lru_cache(maxsize=256)
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    """Memoized get_month_date_range (a month's bounds never change)"""
+    return get_month_date_range(year, month)
+
+
+def resolve_period(
+    period: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    today: date,
+    default: str = "this_month"
+) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Resolve a period name to its (start, end) dates.
     
+    Periods: this_month, last_month, last_3_months, this_year, last_year,
+    all_time (no bounds) and date_range (start_date/end_date, YYYY-MM-DD;
+    malformed dates are a 400). Anything else, including date_range
+    without both dates, resolves as the default period.
+    """
     if period == "this_month":
-        # Get exact first and last day of current month
-        start, last_day_of_month = get_month_date_range(today.year, today.month)
-        end = today  # Up to today within the current month
-    elif period == "last_month":
-        # Get the previous month
+        # First of the current month up to today
+        start, _ = _month_range(today.year, today.month)
+        return start, today
+    if period == "last_month":
         if today.month == 1:
-            last_month_year = today.year - 1
-            last_month = 12
-        else:
-            last_month_year = today.year
-            last_month = today.month - 1
-        # Get exact first and last day of last month
-        start, end = get_month_date_range(last_month_year, last_month)
-    elif period == "last_3_months":
-        # Go back 3 months using exact month boundaries
-        end = today
+            return _month_range(today.year - 1, 12)
+        return _month_range(today.year, today.month - 1)
+    if period == "last_3_months":
+        # Start of the month three months back, up to today
         three_months_ago = today.month - 3
         if three_months_ago <= 0:
-            start_year = today.year - 1
-            start_month = 12 + three_months_ago
+            start, _ = _month_range(today.year - 1, 12 + three_months_ago)
         else:
-            start_year = today.year
-            start_month = three_months_ago
-        start, _ = get_month_date_range(start_year, start_month)
-    elif period == "this_year":
-        # January 1st of current year to today
-        start = date(today.year, 1, 1)
-        end = today
-    elif period == "all_time":
-        # No date filtering
-        start = None
-        end = None
-    elif period == "date_range" and start_date and end_date:
-        # Custom date range
-        start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    else:
-        # Default to this month
-        start, last_day_of_month = get_month_date_range(today.year, today.month)
-        end = today
-    
-    # Get account balances
-    accounts_result = await db.execute(
-        select(
-            func.sum(Account.balance).label('total_balance'),
-            func.count(Account.id).label('account_count')
-        ).where(
-            and_(
-                Account.user_id == SINGLE_USER_ID,
-                Account.is_active == True
+            start, _ = _month_range(today.year, three_months_ago)
+        return start, today
+    if period == "this_year":
+        return date(today.year, 1, 1), today
+    if period == "last_year":
+        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+    if period == "all_time":
+        return None, None
+    if period == "date_range" and start_date and end_date:
+        try:
+            return date.fromisoformat(start_date), date.fromisoformat(end_date)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="start_date and end_date must be dates in YYYY-MM-DD format"
             )
-        )
-    )
-    accounts_data = accounts_result.first()
-    total_balance = float(accounts_data.total_balance or 0)
+    return resolve_period(default, start_date, end_date, today, default="all_time")
+
+
+def daily_summary_filters(start: Optional[date], end: Optional[date]) -> List[Any]:
+    """
+    WHERE clauses selecting the current user's transaction_daily_summary rows
+    for a period (either bound may be None for an open range).
+    """
+    filters = [TransactionDailySummary.user_id == SINGLE_USER_ID]
+    if start is not None:
+        filters.append(TransactionDailySummary.day >= start)
+    if end is not None:
+        filters.append(TransactionDailySummary.day <= end)
+    return filters
+
+
+@router.get("/dashboard")
+@cache(expire=FINANCE_CACHE_TTL, namespace=FINANCE_CACHE_NAMESPACE, key_builder=finance_key_builder)
+async def get_dashboard_metrics(
+    period: str = Query("this_month", description="Period for metrics"),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get real dashboard metrics from database"""
     
-    # Get transaction totals for period
-    # Build date filters
+    start, end = resolve_period(period, start_date, end_date, date.today())
+    
+    # Build date filters for transaction queries
     date_filters = [Transaction.user_id == SINGLE_USER_ID]
     if start is not None:
         date_filters.append(Transaction.transaction_date >= start)
     if end is not None:
         date_filters.append(Transaction.transaction_date <= end)
     
-    transactions_result = await db.execute(
-        select(
-            func.sum(case((Transaction.transaction_type == 'credit', Transaction.amount), else_=0)).label('total_income'),
-            func.sum(case((Transaction.transaction_type == 'debit', Transaction.amount), else_=0)).label('total_expenses'),
-            func.count(Transaction.id).label('transaction_count')
-        ).where(and_(*date_filters))
-    )
-    transactions_data = transactions_result.first()
+    # Top spending categories use the same date filters, debits only
+    category_filters = date_filters + [Transaction.transaction_type == 'debit']
+    
+    # Period totals read the per-day rollup instead of every transaction
+    summary_filters = daily_summary_filters(start, end)
+    
+    # Active-account balance total and count of all accounts in one pass
+    balances_query = select(
+        cast(func.sum(case((Account.is_active == True, Account.balance), else_=0)), Float).label('total_balance'),
+        func.count(Account.id).label('account_count')
+    ).where(Account.user_id == SINGLE_USER_ID)
+    
+    # Transaction totals for period, plus the ACTUAL date range of transaction
+    # data in it (not the period filter dates), which tells us how many
+    # months of real data we have
+    totals_query = select(
+        cast(func.sum(TransactionDailySummary.credit_sum), Float).label('total_income'),
+        cast(func.sum(TransactionDailySummary.debit_sum), Float).label('total_expenses'),
+        func.sum(TransactionDailySummary.tx_count).label('transaction_count'),
+        func.min(TransactionDailySummary.day).label('first_transaction'),
+        func.max(TransactionDailySummary.day).label('last_transaction')
+    ).where(*summary_filters)
+    
+    # Grouped by the integer PK (cheaper to hash than the name, which is
+    # functionally dependent on it)
+    categories_query = select(
+        Category.name,
+        func.sum(Transaction.amount).label('total_amount'),
+        func.count(Transaction.id).label('transaction_count')
+    ).select_from(Transaction).join(
+        Category, Transaction.category_id == Category.id
+    ).where(and_(*category_filters))\
+     .group_by(Category.id).order_by(func.sum(Transaction.amount).desc()).limit(10)
+    
+    # Recent transactions: plain columns with the category name joined in
+    recent_query = select(
+        Transaction.id,
+        Transaction.transaction_date,
+        Transaction.description,
+        Transaction.amount,
+        Transaction.transaction_type,
+        func.coalesce(Category.name, 'Uncategorized').label('category_name')
+    ).select_from(Transaction).outerjoin(
+        Category, Transaction.category_id == Category.id
+    ).where(
+        Transaction.user_id == SINGLE_USER_ID
+    ).order_by(Transaction.transaction_date.desc()).limit(10)
+    
+    # One statement, one round trip: the single-row aggregates are CTEs
+    # cross-joined together, and the two row lists come back as JSON arrays
+    # built by scalar subqueries
+    accounts_cte = balances_query.cte('accounts_totals')
+    totals_cte = totals_query.cte('period_totals')
+    top_categories = categories_query.cte('top_categories')
+    recent = recent_query.cte('recent_transactions')
+    
+    categories_json = select(func.coalesce(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                'name', top_categories.c.name,
+                'amount', top_categories.c.total_amount,
+                'count', top_categories.c.transaction_count
+            ),
+            top_categories.c.total_amount.desc()
+        )),
+        literal_column("'[]'::json")
+    )).scalar_subquery()
+    
+    recent_json = select(func.coalesce(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                'id', recent.c.id,
+                'date', recent.c.transaction_date,
+                'description', recent.c.description,
+                'amount', recent.c.amount,
+                'type', recent.c.transaction_type,
+                'category', recent.c.category_name
+            ),
+            recent.c.transaction_date.desc()
+        )),
+        literal_column("'[]'::json")
+    )).scalar_subquery()
+    
+    dashboard_query = select(
+        accounts_cte.c.total_balance,
+        accounts_cte.c.account_count,
+        totals_cte.c.total_income,
+        totals_cte.c.total_expenses,
+        totals_cte.c.transaction_count,
+        totals_cte.c.first_transaction,
+        totals_cte.c.last_transaction,
+        categories_json.label('categories'),
+        recent_json.label('recent_transactions')
+    ).select_from(accounts_cte.join(totals_cte, true()))
+    
+    dashboard_result = await execute_in_new_session(dashboard_query)
+    return build_dashboard_response(dashboard_result.one(), period, start, end)
+
+
+def build_dashboard_response(
+    dashboard: Any,
+    period: str,
+    start: Optional[date],
+    end: Optional[date]
+) -> Dict[str, Any]:
+    """Shape the single dashboard row (aggregates plus JSON lists) into the response"""
+    total_balance = dashboard.total_balance or 0.0
     
-    total_income = float(transactions_data.total_income or 0)
-    total_expenses = float(transactions_data.total_expenses or 0)
+    total_income = dashboard.total_income or 0.0
+    total_expenses = dashboard.total_expenses or 0.0
     net_income = total_income - total_expenses
     
-    # Get top spending categories (apply same date filters)
-    category_filters = [Transaction.user_id == SINGLE_USER_ID, Transaction.transaction_type == 'debit']
-    if start is not None:
-        category_filters.append(Transaction.transaction_date >= start)
-    if end is not None:
-        category_filters.append(Transaction.transaction_date <= end)
-    
-    categories_result = await db.execute(
-        select(
-            Category.name,
-            func.sum(Transaction.amount).label('total_amount'),
-            func.count(Transaction.id).label('transaction_count')
-        ).select_from(Transaction).join(
-            Category, Transaction.category_id == Category.id
-        ).where(and_(*category_filters))
-        .group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(10)
-    )
-    
-    categories = []
-    for row in categories_result:
-        categories.append({
-            "name": row.name,
-            "amount": float(row.total_amount),
-            "count": row.transaction_count
-        })
-    
-    # Get recent transactions with eager loading
-    recent_result = await db.execute(
-        select(Transaction)
-        .options(selectinload(Transaction.category))
-        .where(
-            Transaction.user_id == SINGLE_USER_ID
-        ).order_by(Transaction.transaction_date.desc()).limit(10)
-    )
-    
-    recent_transactions = []
-    for trans in recent_result.scalars():
-        recent_transactions.append({
-            "id": trans.id,
-            "date": trans.transaction_date.isoformat(),
-            "description": trans.description,
-            "amount": float(trans.amount),
-            "type": trans.transaction_type,
-            "category": trans.category.name if trans.category else "Uncategorized"
-        })
+    # The asyncpg dialect decodes json columns on fetch, so the aggregates
+    # are already lists (numbers as float); COALESCE covers empty periods
+    categories = dashboard.categories or []
+    recent_transactions = dashboard.recent_transactions or []
     
     # Calculate quick stats
-    transaction_count = int(transactions_data.transaction_count or 0)
+    transaction_count = int(dashboard.transaction_count or 0)
     if start is not None and end is not None:
         days_in_period = max((end - start).days, 1)
         average_daily_spending = total_expenses / days_in_period if days_in_period > 0 else 0
@@ -187,38 +282,22 @@ async def get_dashboard_metrics(
         # For all_time, don't calculate daily average
         average_daily_spending = 0
     
-    # Get ACTUAL date range from transaction data in DB (not the period filter dates)
-    # This tells us how many months of real data we have
-    actual_date_range_result = await db.execute(
-        select(
-            func.min(Transaction.transaction_date).label('first_transaction'),
-            func.max(Transaction.transaction_date).label('last_transaction')
-        ).where(and_(*date_filters))
-    )
-    actual_dates = actual_date_range_result.first()
-    
     # Calculate average monthly spending based on ACTUAL data range
     average_monthly_spending = 0.0
     months_of_data = 0.0
     data_start_date = None
     data_end_date = None
     
-    if actual_dates.first_transaction and actual_dates.last_transaction:
-        data_start_date = actual_dates.first_transaction
-        data_end_date = actual_dates.last_transaction
+    if dashboard.first_transaction and dashboard.last_transaction:
+        data_start_date = dashboard.first_transaction
+        data_end_date = dashboard.last_transaction
         # Calculate months between first and last transaction
         days_of_data = (data_end_date - data_start_date).days + 1  # +1 to include both endpoints
         months_of_data = days_of_data / 30.44  # Average days per month
         if months_of_data > 0:
             average_monthly_spending = total_expenses / months_of_data
     
-    # Get account count
-    accounts_result = await db.execute(
-        select(func.count(func.distinct(Account.id))).where(
-            Account.user_id == SINGLE_USER_ID
-        )
-    )
-    account_count = accounts_result.scalar() or 0
+    account_count = dashboard.account_count or 0
     
     # Calculate savings rate
     savings_rate = ((total_income - total_expenses) / total_income * 100) if total_income > 0 else 0
@@ -253,71 +332,48 @@ async def get_dashboard_metrics(
     }
 
 
-@router.get("/transactions")
+@router.get("/transactions", response_class=ORJSONResponse)
 async def get_transactions(
     limit: int = Query(100, ge=1, le=10000, description="Number of transactions to return"),
     skip: int = Query(0, ge=0, description="Number of transactions to skip"),
     period: Optional[str] = Query(None, description="Period for summary stats: this_month, last_month, last_3_months, this_year, all_time, date_range"),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    category: Optional[str] = None,
-    db: AsyncSession = Depends(get_async_db)
-) -> Dict[str, Any]:
-    """Get transactions from database with period summary statistics (Finance Manager compatible API)"""
-    
-    # Determine date range for summary statistics based on period
-    # Using bulletproof month boundary calculation with calendar.monthrange()
-    summary_start = None
-    summary_end = None
-    today = date.today()
-    
-    if period:
-        if period == "this_month":
-            # Get exact first and last day of current month
-            summary_start, last_day_of_month = get_month_date_range(today.year, today.month)
-            summary_end = today  # Up to today within the current month
-        elif period == "last_month":
-            # Get the previous month
-            if today.month == 1:
-                # If January, go to December of previous year
-                last_month_year = today.year - 1
-                last_month = 12
-            else:
-                last_month_year = today.year
-                last_month = today.month - 1
-            # Get exact first and last day of last month
-            summary_start, summary_end = get_month_date_range(last_month_year, last_month)
-        elif period == "last_3_months":
-            # Go back 3 months (approximately 90 days, but use exact month boundaries)
-            summary_end = today
-            # Calculate 3 months ago
-            three_months_ago = today.month - 3
-            if three_months_ago <= 0:
-                summary_start_year = today.year - 1
-                summary_start_month = 12 + three_months_ago
-            else:
-                summary_start_year = today.year
-                summary_start_month = three_months_ago
-            summary_start, _ = get_month_date_range(summary_start_year, summary_start_month)
-        elif period == "this_year":
-            # January 1st of current year to today
-            summary_start = date(today.year, 1, 1)
-            summary_end = today
-        elif period == "all_time":
-            # No date filtering
-            summary_start = None
-            summary_end = None
-        elif period == "date_range" and start_date and end_date:
-            # Custom date range from parameters
-            summary_start = datetime.strptime(start_date, "%Y-%m-%d").date()
-            summary_end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    elif start_date and end_date:
-        # Use provided date range if no period specified
-        summary_start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        summary_end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    
-    # Build query for transactions list
-    query = select(Transaction).where(
+    category: Optional[str] = None
+) -> ORJSONResponse:
+    """
+    Get transactions from database with period summary statistics (Finance Manager compatible API)
+    
+    Up to 10k rows per page, so the body is rendered by orjson directly
+    (dates included) instead of passing through FastAPI's jsonable_encoder.
+    """
+    
+    # Date range for summary statistics (and the list); without a period,
+    # an explicit start/end pair is used if given, otherwise all time
+    summary_start, summary_end = resolve_period(
+        period or "date_range", start_date, end_date, date.today(), default="all_time"
+    )
+    
+    # A category filter needs a matching category, so it can use an INNER JOIN
+    filter_category = bool(category and category != "all")
+    
+    # Build query for transactions list: plain columns with the category and
+    # account names joined in, so the page is a single round trip with no
+    # ORM objects hydrated per row
+    query = select(
+        Transaction.id,
+        Transaction.transaction_date,
+        Transaction.description,
+        cast(Transaction.amount, Float).label('amount'),
+        Transaction.transaction_type,
+        Transaction.is_processed,
+        func.coalesce(Category.name, 'Uncategorized').label('category_name'),
+        func.coalesce(Account.name, 'Unknown').label('account_name')
+    ).select_from(Transaction).join(
+        Category, Transaction.category_id == Category.id, isouter=not filter_category
+    ).outerjoin(
+        Account, Transaction.account_id == Account.id
+    ).where(
         Transaction.user_id == SINGLE_USER_ID
     )
     
@@ -329,54 +385,59 @@ async def get_transactions(
         query = query.where(Transaction.transaction_date <= summary_end)
     
     # Apply category filter
-    if category and category != "all":
-        query = query.join(Category).where(Category.name == category)
-    
-    # Get total count
-    count_result = await db.execute(
-        select(func.count()).select_from(query.subquery())
+    if filter_category:
+        query = query.where(Category.name == category)
+    
+    # Get income, expenses, and transaction count for period from the
+    # per-day rollup
+    summary_query = select(
+        cast(func.sum(TransactionDailySummary.credit_sum), Float).label('total_income'),
+        cast(func.sum(TransactionDailySummary.debit_sum), Float).label('total_expenses'),
+        func.sum(TransactionDailySummary.tx_count).label('transaction_count')
+    ).where(*daily_summary_filters(summary_start, summary_end))
+    
+    # Apply limit and offset (Finance Manager approach). COUNT(*) OVER () is
+    # evaluated before LIMIT, so every page row carries the total match count
+    page_query = query.add_columns(func.count().over().label('total_count'))\
+        .order_by(Transaction.transaction_date.desc()).limit(limit).offset(skip)
+    
+    # Page and period summary are independent; run them concurrently
+    result, summary_result = await asyncio.gather(
+        execute_in_new_session(page_query),
+        execute_in_new_session(summary_query)
     )
-    total_count = count_result.scalar() or 0
-    
-    # Apply limit and offset (Finance Manager approach)
-    query = query.order_by(Transaction.transaction_date.desc()).limit(limit).offset(skip)
-    
-    # Execute query
-    result = await db.execute(query.options(selectinload(Transaction.category), selectinload(Transaction.account)))
+    page_rows = result.mappings().all()
+    
+    if page_rows:
+        total_count = page_rows[0]['total_count']
+    elif skip > 0:
+        # Paged past the end: no row to read the window count from
+        count_result = await execute_in_new_session(
+            select(func.count()).select_from(query.subquery())
+        )
+        total_count = count_result.scalar() or 0
+    else:
+        total_count = 0
     
     # Format transactions
-    transactions = []
-    for trans in result.scalars():
-        transactions.append({
-            "id": trans.id,
-            "transaction_date": trans.transaction_date.isoformat(),
-            "description": trans.description,
-            "amount": float(trans.amount),
-            "transaction_type": trans.transaction_type,
-            "category_name": trans.category.name if trans.category else "Uncategorized",
-            "account_name": trans.account.name if trans.account else "Unknown",
-            "is_processed": trans.is_processed
-        })
-    
-    # Calculate summary statistics for the period
-    summary_filters = [Transaction.user_id == SINGLE_USER_ID]
-    if summary_start is not None:
-        summary_filters.append(Transaction.transaction_date >= summary_start)
-    if summary_end is not None:
-        summary_filters.append(Transaction.transaction_date <= summary_end)
+    transactions = [
+        {
+            "id": row['id'],
+            "transaction_date": row['transaction_date'],
+            "description": row['description'],
+            "amount": row['amount'],
+            "transaction_type": row['transaction_type'],
+            "category_name": row['category_name'],
+            "account_name": row['account_name'],
+            "is_processed": row['is_processed']
+        }
+        for row in page_rows
+    ]
     
-    # Get income, expenses, and transaction count for period
-    summary_result = await db.execute(
-        select(
-            func.sum(case((Transaction.transaction_type == 'credit', Transaction.amount), else_=0)).label('total_income'),
-            func.sum(case((Transaction.transaction_type == 'debit', Transaction.amount), else_=0)).label('total_expenses'),
-            func.count(Transaction.id).label('transaction_count')
-        ).where(and_(*summary_filters))
-    )
     summary_data = summary_result.first()
     
-    total_income = float(summary_data.total_income or 0)
-    total_expenses = float(summary_data.total_expenses or 0)
+    total_income = summary_data.total_income or 0.0
+    total_expenses = summary_data.total_expenses or 0.0
     balance = total_income - total_expenses
     transaction_count = int(summary_data.transaction_count or 0)
     
@@ -401,7 +462,7 @@ async def get_transactions(
     
     period_display = get_period_display(period or "custom", summary_start, summary_end)
     
-    return {
+    return ORJSONResponse({
         "data": {
             "transactions": transactions,
             "total_count": total_count,
@@ -414,26 +475,28 @@ async def get_transactions(
             "period": period_display,
             "period_type": period or "all_time",
             "date_range": {
-                "start": summary_start.isoformat() if summary_start else None,
-                "end": summary_end.isoformat() if summary_end else None
+                "start": summary_start,
+                "end": summary_end
             }
         }
-    }
+    })
 
 
 @router.get("/categories")
+@cache(expire=FINANCE_CACHE_TTL, namespace=FINANCE_CACHE_NAMESPACE, key_builder=finance_key_builder)
 async def get_categories(
     db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get all categories with spending totals"""
     
-    # Get categories with spending totals
+    # Get categories with spending totals (name/type are functionally
+    # dependent on the PK, so grouping by id alone is enough)
     result = await db.execute(
         select(
             Category.id,
             Category.name,
             Category.category_type,
-            func.coalesce(func.sum(Transaction.amount), 0).label('total_spent'),
+            cast(func.coalesce(func.sum(Transaction.amount), 0), Float).label('total_spent'),
             func.count(Transaction.id).label('transaction_count')
         ).select_from(Category).outerjoin(
             Transaction, 
@@ -443,7 +506,7 @@ async def get_categories(
             )
         ).where(
             Category.is_active == True
-        ).group_by(Category.id, Category.name, Category.category_type)
+        ).group_by(Category.id)
         .order_by(Category.name)
     )
     
@@ -453,7 +516,7 @@ async def get_categories(
             "id": row.id,
             "name": row.name,
             "type": row.category_type,
-            "total_spent": float(row.total_spent),
+            "total_spent": row.total_spent,
             "transaction_count": row.transaction_count
         })
     
@@ -462,55 +525,61 @@ async def get_categories(
     }
 
 
-@router.get("/accounts")
+@router.get("/accounts", response_class=ORJSONResponse)
 async def get_accounts(
     db: AsyncSession = Depends(get_async_db)
-) -> Dict[str, Any]:
-    """Get all accounts with balances"""
+) -> ORJSONResponse:
+    """Get all accounts with balances (rendered by orjson directly, like /transactions)"""
+    
+    # Calculate actual balance from transactions for every account in one
+    # grouped query (LEFT JOIN keeps accounts without transactions)
+    calculated_balance = cast(func.coalesce(
+        func.sum(case(
+            (Transaction.transaction_type == 'credit', Transaction.amount),
+            else_=-Transaction.amount
+        )),
+        0
+    ), Float).label('calculated_balance')
     
     result = await db.execute(
-        select(Account).where(
+        select(Account, calculated_balance)
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.account_id == Account.id,
+                Transaction.user_id == SINGLE_USER_ID
+            )
+        )
+        .where(
             and_(
                 Account.user_id == SINGLE_USER_ID,
                 Account.is_active == True
             )
-        ).order_by(Account.name)
+        )
+        .group_by(Account.id)
+        .order_by(Account.name)
     )
     
-    accounts = []
-    for acc in result.scalars():
-        # Calculate actual balance from transactions
-        trans_result = await db.execute(
-            select(
-                func.sum(case(
-                    (Transaction.transaction_type == 'credit', Transaction.amount),
-                    else_=-Transaction.amount
-                )).label('calculated_balance')
-            ).where(
-                and_(
-                    Transaction.account_id == acc.id,
-                    Transaction.user_id == SINGLE_USER_ID
-                )
-            )
-        )
-        calculated = trans_result.scalar() or 0
-        
-        accounts.append({
+    accounts = [
+        {
             "id": acc.id,
             "name": acc.name,
             "account_type": acc.account_type,
             "balance": float(acc.balance),
-            "calculated_balance": float(calculated),
+            "calculated_balance": calculated,
             "bank_name": acc.bank_name,
             "account_number": acc.account_number[-4:] if acc.account_number else None
-        })
+        }
+        for acc, calculated in result.all()
+    ]
     
-    return {
+    return ORJSONResponse({
         "data": accounts
-    }
+    })
 
 
 @router.get("/cumulative-spending")
+@cache(expire=FINANCE_CACHE_TTL, namespace=FINANCE_CACHE_NAMESPACE, key_builder=finance_key_builder)
 async def get_cumulative_spending(
     period: str = Query("this_year"),
     start_date: Optional[str] = None,
@@ -521,124 +590,65 @@ async def get_cumulative_spending(
     Get cumulative spending data over time by category (Finance Manager compatible format)
     Returns daily cumulative spending for each category over the selected period
     """
-    # Determine date range using bulletproof month logic
-    today = date.today()
+    start, end = resolve_period(period, start_date, end_date, date.today(), default="this_year")
     
-    if period == "this_month":
-        start, last_day_of_month = get_month_date_range(today.year, today.month)
-        end = today
-    elif period == "last_month":
-        if today.month == 1:
-            last_month_year = today.year - 1
-            last_month = 12
-        else:
-            last_month_year = today.year
-            last_month = today.month - 1
-        start, end = get_month_date_range(last_month_year, last_month)
-    elif period == "last_3_months":
-        end = today
-        three_months_ago = today.month - 3
-        if three_months_ago <= 0:
-            start_year = today.year - 1
-            start_month = 12 + three_months_ago
-        else:
-            start_year = today.year
-            start_month = three_months_ago
-        start, _ = get_month_date_range(start_year, start_month)
-    elif period == "this_year":
-        start = date(today.year, 1, 1)
-        end = today
-    elif period == "last_year":
-        start = date(today.year-1, 1, 1)
-        end = date(today.year-1, 12, 31)
-    elif period == "all_time":
-        start = None
-        end = None
-    elif period == "date_range" and start_date and end_date:
-        start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    else:
-        start = date(today.year, 1, 1)
-        end = today
+    # Credits count positive, debits negative; the daily summary already holds
+    # one row per (day, category), so the grouping below only merges categories
+    # that share a name
+    net_amount = TransactionDailySummary.credit_sum - TransactionDailySummary.debit_sum
+    category_name = func.coalesce(Category.name, 'Uncategorized')
     
-    # Build base query filters
-    base_filters = [Transaction.user_id == SINGLE_USER_ID]
-    if start is not None:
-        base_filters.append(Transaction.transaction_date >= start)
-    if end is not None:
-        base_filters.append(Transaction.transaction_date <= end)
-    
-    # Get all transactions for the period with categories
-    transactions_query = (
-        select(Transaction, Category.name.label('category_name'))
-        .outerjoin(Category, Transaction.category_id == Category.id)
-        .where(*base_filters)
-        .order_by(Transaction.transaction_date.asc())
+    daily_query = (
+        select(
+            TransactionDailySummary.day,
+            category_name.label('category'),
+            cast(func.sum(net_amount), Float).label('net')
+        )
+        .select_from(TransactionDailySummary)
+        .outerjoin(Category, TransactionDailySummary.category_id == Category.id)
+        .where(*daily_summary_filters(start, end))
+        .group_by(TransactionDailySummary.day, category_name)
+        .order_by(TransactionDailySummary.day)
     )
     
-    result = await db.execute(transactions_query)
-    transactions = result.all()
-    
-    # Group transactions by date and category
-    daily_data = {}
-    categories = set()
+    result = await db.execute(daily_query)
+    rows = result.all()
+    
+    # Pivot into a [day, category] grid of daily nets; cells without activity
+    # stay 0, so a column-wise cumsum carries each running total forward
+    days = list(dict.fromkeys(row.day for row in rows))
+    category_names = sorted({row.category for row in rows})
+    day_index = {day: i for i, day in enumerate(days)}
+    category_index = {cat: j for j, cat in enumerate(category_names)}
+    
+    nets = np.zeros((len(days), len(category_names)), dtype=np.float64)
+    day_categories = [{} for _ in days]
+    for row in rows:
+        i = day_index[row.day]
+        net = row.net
+        nets[i, category_index[row.category]] = net
+        day_categories[i][row.category] = net
+    
+    cumulative = nets.cumsum(axis=0)
+    # A day's positive category nets count as income, negative ones as expenses
+    cumulative_income = np.where(nets > 0, nets, 0.0).sum(axis=1).cumsum()
+    cumulative_expenses = np.where(nets < 0, -nets, 0.0).sum(axis=1).cumsum()
     
-    for transaction, category_name in transactions:
-        date_str = transaction.transaction_date.isoformat()
-        category = category_name or "Uncategorized"
-        categories.add(category)
-        
-        if date_str not in daily_data:
-            daily_data[date_str] = {}
-        
-        if category not in daily_data[date_str]:
-            daily_data[date_str][category] = 0
-        
-        # For expenses (debit), use negative amount; for income (credit), use positive
-        amount = float(transaction.amount) if transaction.transaction_type == 'credit' else -float(transaction.amount)
-        daily_data[date_str][category] += amount
-    
-    # Sort dates
-    sorted_dates = sorted(daily_data.keys())
-    
-    # Calculate cumulative totals
     cumulative_data = []
-    running_totals = {cat: 0 for cat in categories}
-    
-    # Add special categories for aggregated data
-    categories.add("Income")
-    categories.add("Expenses") 
-    categories.add("Savings")
-    running_totals["Income"] = 0
-    running_totals["Expenses"] = 0
-    running_totals["Savings"] = 0
-    
-    for date_str in sorted_dates:
-        day_data = daily_data[date_str]
-        
-        # Update running totals for each category
-        daily_income = 0
-        daily_expenses = 0
-        
-        for category, amount in day_data.items():
-            running_totals[category] += amount
-            
-            if amount > 0:
-                daily_income += amount
-            else:
-                daily_expenses += abs(amount)
-        
-        # Update aggregated totals
-        running_totals["Income"] += daily_income
-        running_totals["Expenses"] += daily_expenses
+    for i, day in enumerate(days):
+        running_totals = dict(zip(category_names, cumulative[i].tolist()))
+        running_totals["Income"] = float(cumulative_income[i])
+        running_totals["Expenses"] = float(cumulative_expenses[i])
         running_totals["Savings"] = running_totals["Income"] - running_totals["Expenses"]
-        
         cumulative_data.append({
-            "date": date_str,
-            "categories": dict(day_data),
-            "cumulative": dict(running_totals)
+            "date": day.isoformat(),
+            "categories": day_categories[i],
+            "cumulative": running_totals
         })
     
+    # Add special categories for aggregated data
+    categories = set(category_names) | {"Income", "Expenses", "Savings"}
+    
     return {
         "data": {
             "chart_data": cumulative_data,
@@ -653,9 +663,7 @@ async def get_cumulative_spending(
 
 
 @router.get("/budget/category-analysis")
-async def get_budget_category_analysis(
-    db: AsyncSession = Depends(get_async_db)
-) -> Dict[str, Any]:
+async def get_budget_category_analysis() -> Dict[str, Any]:
     """
     Get budget analysis data comparing current year vs previous year spending by category.
     
@@ -672,16 +680,31 @@ async def get_budget_category_analysis(
         # Find the actual date range of transactions in the current year
         # This gives us the precise months of data, not just the month number
         date_range_query = select(
-            func.min(Transaction.transaction_date).label('first_transaction'),
-            func.max(Transaction.transaction_date).label('last_transaction')
+            func.min(TransactionDailySummary.day).label('first_transaction'),
+            func.max(TransactionDailySummary.day).label('last_transaction')
         ).filter(
-            and_(
-                Transaction.user_id == SINGLE_USER_ID,
-                extract('year', Transaction.transaction_date) == current_year
-            )
+            *daily_summary_filters(date(current_year, 1, 1), date(current_year, 12, 31))
         )
         
-        date_range_result = await db.execute(date_range_query)
+        # Current and previous year expense totals for every category in one
+        # grouped scan of the per-day rollup (debit_abs_sum = expenses only)
+        summary_year = extract('year', TransactionDailySummary.day)
+        spent = TransactionDailySummary.debit_abs_sum
+        category_totals_query = select(
+            Category.id,
+            Category.name,
+            cast(func.sum(case((summary_year == current_year, spent), else_=0)), Float).label('current_year_total'),
+            cast(func.sum(case((summary_year == previous_year, spent), else_=0)), Float).label('previous_year_total')
+        ).join(
+            TransactionDailySummary, Category.id == TransactionDailySummary.category_id
+        ).filter(
+            *daily_summary_filters(date(previous_year, 1, 1), date(current_year, 12, 31))
+        ).group_by(Category.id, Category.name)
+        
+        date_range_result, category_totals_result = await asyncio.gather(
+            execute_in_new_session(date_range_query),
+            execute_in_new_session(category_totals_query)
+        )
         date_range = date_range_result.first()
         
         # Calculate actual fractional months of data based on date range
@@ -694,48 +717,11 @@ async def get_budget_category_analysis(
             current_year_months = 1.0  # Default to 1 if no data found
             latest_transaction_date = None
         
-        # Get all categories that have transactions
-        categories_query = select(Category.id, Category.name).join(
-            Transaction, Category.id == Transaction.category_id
-        ).filter(
-            Transaction.user_id == SINGLE_USER_ID
-        ).distinct()
-        
-        result = await db.execute(categories_query)
-        categories_with_spending = result.all()
-        
         budget_analysis = []
         
-        for category_id, category_name in categories_with_spending:
-            # Get current year data (only debit/expense transactions)
-            current_year_query = select(
-                func.sum(func.abs(Transaction.amount))
-            ).filter(
-                and_(
-                    Transaction.user_id == SINGLE_USER_ID,
-                    Transaction.category_id == category_id,
-                    extract('year', Transaction.transaction_date) == current_year,
-                    Transaction.transaction_type == 'debit'  # Only expenses
-                )
-            )
-            
-            current_year_result = await db.execute(current_year_query)
-            current_year_total = float(current_year_result.scalar() or 0)
-            
-            # Get previous year data (only debit/expense transactions)
-            previous_year_query = select(
-                func.sum(func.abs(Transaction.amount))
-            ).filter(
-                and_(
-                    Transaction.user_id == SINGLE_USER_ID,
-                    Transaction.category_id == category_id,
-                    extract('year', Transaction.transaction_date) == previous_year,
-                    Transaction.transaction_type == 'debit'  # Only expenses
-                )
-            )
-            
-            previous_year_result = await db.execute(previous_year_query)
-            previous_year_total = float(previous_year_result.scalar() or 0)
+        for row in category_totals_result:
+            current_year_total = row.current_year_total or 0.0
+            previous_year_total = row.previous_year_total or 0.0
             
             # Calculate monthly averages
             # Current year: divide by actual months of data available
@@ -749,7 +735,7 @@ async def get_budget_category_analysis(
             # Only include categories with spending in either year
             if current_year_total > 0 or previous_year_total > 0:
                 budget_analysis.append({
-                    "category": category_name,
+                    "category": row.name,
                     "thisYearTotal": float(current_year_total),
                     "thisYearMonthlyAvg": float(current_year_monthly_avg),
                     "lastYearTotal": float(previous_year_total),
@@ -8,9 +8,10 @@ Handles CSV file uploads and processing through the pipeline:
 - Stats endpoint for getting processing statistics
 """
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import contextlib
 import os
 import uuid
 import asyncio
@@ -18,23 +19,122 @@ import subprocess
 import sys
 from pathlib import Path
 from datetime import datetime
+from collections import Counter
+import aiofiles
+import aiofiles.os
+from cachetools import TTLCache
 
+from app.core.config import settings
 from app.core.database import get_async_db
+from app.core.responses import ORJSONResponse
 from app.services.banking.pipeline import pipeline
 
 router = APIRouter(tags=["File Processing"])
 
-# Store processing status in memory (in production, use Redis)
-processing_status = {}
+# Store processing status in memory (in production, use Redis). Bounded and
+# expiring, so finished jobs don't accumulate for the life of the process
+processing_status: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# Section separator for step output
+SEPARATOR = "=" * 50
 
 # Temporary upload directory
 UPLOAD_DIR = Path("/tmp/capricorn_uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Media types browsers and HTTP clients send for CSV files
+CSV_CONTENT_TYPES = frozenset({
+    "text/csv",
+    "application/csv",
+    "application/vnd.ms-excel",
+    "application/octet-stream",
+    "text/plain",
+})
+
+# Bytes of an upload inspected when checking it looks like a CSV
+CSV_SNIFF_SIZE = 4096
+
+# file_id -> saved upload path for files uploaded through this process
+# (other workers' uploads are found by a directory scan on a miss)
+uploaded_files: Dict[str, Path] = {}
+
 # Import single user constant
 from app.core.constants import SINGLE_USER_ID
 
 
+async def check_csv_upload(file: UploadFile) -> None:
+    """
+    Reject uploads that are not CSV files (HTTP 400) before their body is
+    copied anywhere: filename extension and declared media type first, then
+    a sniff of the first few KB - binary content (NUL bytes) or a first line
+    without a comma fails. The file is rewound afterwards.
+    """
+    if not file.filename or not file.filename.lower().endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    
+    content_type = (file.content_type or "application/octet-stream").split(";")[0].strip().lower()
+    if content_type not in CSV_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported content type '{content_type}'; only CSV files are supported")
+    
+    head = await file.read(CSV_SNIFF_SIZE)
+    await file.seek(0)
+    if not head or b"\0" in head or b"," not in head.split(b"\n", 1)[0]:
+        raise HTTPException(status_code=400, detail="File content is not CSV")
+
+
+async def save_upload(file: UploadFile, file_path: Path) -> int:
+    """
+    Stream an uploaded file to disk chunk by chunk, so peak memory stays at
+    one chunk regardless of file size. Writes go through aiofiles and never
+    block the event loop. The body is written under a .part name and renamed
+    into place, so directory scans (in any worker) never pick up a partially
+    written file. Returns the number of bytes written.
+    """
+    part_path = file_path.with_name(file_path.name + ".part")
+    file_size = 0
+    try:
+        async with aiofiles.open(part_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
+                file_size += len(chunk)
+        await aiofiles.os.replace(part_path, file_path)
+    except BaseException:
+        # open() itself may have failed, leaving no .part file to remove;
+        # the original error is what the caller needs to see
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(part_path)
+        raise
+    return file_size
+
+
+def classify_upload(filename: str) -> str:
+    """Bank/file type from an upload's filename"""
+    name_upper = filename.upper()
+    if "AMEX" in name_upper:
+        return "AMEX_CREDIT"
+    if "CREDIT" in name_upper:
+        return "BOFA_CREDIT"
+    return "BOFA_CHECKING"
+
+
+def find_upload(file_id: str) -> Optional[Path]:
+    """Look up an uploaded file by ID: index first, one directory scan on a miss"""
+    file_path = uploaded_files.get(file_id)
+    if file_path is not None:
+        return file_path
+    
+    marker = f"_{file_id}_"
+    with os.scandir(UPLOAD_DIR) as entries:
+        for entry in entries:
+            if marker in entry.name and not entry.name.endswith(".part"):
+                file_path = uploaded_files[file_id] = Path(entry.path)
+                return file_path
+    return None
+
+
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
@@ -46,11 +146,13 @@ async def upload_file(
     Accepts CSV files from:
     - Bank of America (Checking and Credit)
     - American Express
+    
+    The file is on disk before the file_id is returned, so any worker can
+    process it by ID straight away.
     """
     try:
         # Validate file type
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Only CSV files are supported")
+        await check_csv_upload(file)
         
         # Generate unique filename
         file_id = str(uuid.uuid4())
@@ -59,9 +161,8 @@ async def upload_file(
         file_path = UPLOAD_DIR / safe_filename
         
         # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        file_size = await save_upload(file, file_path)
+        uploaded_files[file_id] = file_path
         
         return {
             "status": "success",
@@ -69,11 +170,13 @@ async def upload_file(
             "original_filename": file.filename,
             "saved_filename": safe_filename,
             "file_path": str(file_path),
-            "file_size": len(content),
+            "file_size": file_size,
             "uploaded_at": datetime.now().isoformat(),
             "message": f"File uploaded successfully. Use file_id '{file_id}' to process."
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -96,12 +199,10 @@ async def process_file(
     """
     try:
         # Find the uploaded file
-        matching_files = list(UPLOAD_DIR.glob(f"*_{file_id}_*"))
-        if not matching_files:
+        file_path = find_upload(file_id)
+        if file_path is None:
             raise HTTPException(status_code=404, detail=f"File with ID '{file_id}' not found")
         
-        file_path = matching_files[0]
-        
         # Process through pipeline
         result = await pipeline.process_uploaded_file(
             file_path=str(file_path),
@@ -111,10 +212,13 @@ async def process_file(
         
         # Clean up uploaded file if successful
         if result.get("status") == "success":
-            os.remove(file_path)
+            await asyncio.to_thread(os.remove, file_path)
+            uploaded_files.pop(file_id, None)
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
@@ -132,8 +236,7 @@ async def upload_and_process(
     """
     try:
         # Validate file type
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Only CSV files are supported")
+        await check_csv_upload(file)
         
         # Save uploaded file
         file_id = str(uuid.uuid4())
@@ -141,9 +244,8 @@ async def upload_and_process(
         safe_filename = f"{timestamp}_{file_id}_{file.filename}"
         file_path = UPLOAD_DIR / safe_filename
         
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        file_size = await save_upload(file, file_path)
+        uploaded_files[file_id] = file_path
         
         # Process immediately
         result = await pipeline.process_uploaded_file(
@@ -155,7 +257,7 @@ async def upload_and_process(
         # Add upload info to result
         result["upload_info"] = {
             "original_filename": file.filename,
-            "file_size": len(content),
+            "file_size": file_size,
             "uploaded_at": datetime.now().isoformat()
         }
         
@@ -166,6 +268,8 @@ async def upload_and_process(
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload and process failed: {str(e)}")
 
@@ -204,7 +308,7 @@ async def process_files_with_steps(
     process_id = str(uuid.uuid4())
     
     # Initialize status
-    processing_status[process_id] = {
+    processing_status[process_id] = status = {
         "status": "started",
         "current_step": None,
         "steps": {
@@ -218,7 +322,7 @@ async def process_files_with_steps(
     }
     
     # Start processing in background
-    asyncio.create_task(process_files_async_with_steps(process_id, db))
+    asyncio.create_task(process_files_async_with_steps(status, db))
     
     return {
         "success": True,
@@ -227,170 +331,148 @@ async def process_files_with_steps(
     }
 
 
-async def process_files_async_with_steps(process_id: str, db: AsyncSession):
-    """Process files asynchronously with step-by-step status updates"""
+async def process_files_async_with_steps(status: Dict[str, Any], db: AsyncSession):
+    """
+    Process files asynchronously with step-by-step status updates.
+    Updates the job's status dict directly, so the job keeps running even if
+    its processing_status entry expires first.
+    """
+    async def begin_step(step: str, message: str):
+        """Mark a step as processing, then pause if a demo delay is configured"""
+        status["current_step"] = step
+        status["steps"][step] = {
+            "status": "processing",
+            "message": message,
+            "output": []
+        }
+        if settings.PROCESSING_STEP_DELAY > 0:
+            await asyncio.sleep(settings.PROCESSING_STEP_DELAY)
+    
     try:
-        # Get all uploaded CSV files from the upload directory  
-        upload_files = list(UPLOAD_DIR.glob("*.csv"))
-        if not upload_files:
-            processing_status[process_id]["status"] = "failed"
-            processing_status[process_id]["error"] = "No files to process"
+        # Get all uploaded CSV files from the upload directory with their
+        # stats: one scandir pass in a worker thread instead of a glob plus
+        # a blocking syscall per file on the event loop
+        def scan_uploads():
+            with os.scandir(UPLOAD_DIR) as entries:
+                return [
+                    (Path(entry.path), entry.stat())
+                    for entry in entries
+                    if entry.name.endswith(".csv") and entry.is_file()
+                ]
+        
+        file_stats = await asyncio.to_thread(scan_uploads)
+        if not file_stats:
+            status["status"] = "failed"
+            status["error"] = "No files to process"
             return
         
-        # Process all files
-        all_files = sorted(upload_files, key=lambda f: f.stat().st_mtime)
+        # Process oldest first
+        file_stats.sort(key=lambda entry: entry[1].st_mtime)
+        all_files = [f for f, _ in file_stats]
         
         # Step 1: Classification
-        processing_status[process_id]["current_step"] = "classification"
-        processing_status[process_id]["steps"]["classification"] = {
-            "status": "processing",
-            "message": "Classifying files by bank type...",
-            "output": []
-        }
+        await begin_step("classification", "Classifying files by bank type...")
+        
+        classified = [(file.name, classify_upload(file.name)) for file in all_files]
+        file_types = Counter(file_type for _, file_type in classified)
+        
+        classification_output = [
+            "🔍 Starting file classification...",
+            SEPARATOR,
+            *[f"✅ {name} → {file_type}" for name, file_type in classified],
+            SEPARATOR,
+            "📊 Classification Summary:",
+            *[f"   {ft}: {count} file(s)" for ft, count in file_types.items()]
+        ]
         
-        # Simulate classification with output
-        await asyncio.sleep(0.5)
-        
-        classification_output = ["🔍 Starting file classification...", "=" * 50]
-        file_types = {}
-        
-        for file in all_files:
-            file_type = "BOFA_CHECKING"
-            if "AMEX" in file.name.upper():
-                file_type = "AMEX_CREDIT"
-            elif "CREDIT" in file.name.upper():
-                file_type = "BOFA_CREDIT"
-            
-            file_types[file_type] = file_types.get(file_type, 0) + 1
-            classification_output.append(f"✅ {file.name} → {file_type}")
-        
-        classification_output.extend([
-            "=" * 50,
-            "📊 Classification Summary:"
-        ])
-        for ft, count in file_types.items():
-            classification_output.append(f"   {ft}: {count} file(s)")
-        
-        processing_status[process_id]["steps"]["classification"]["output"] = classification_output
-        processing_status[process_id]["steps"]["classification"]["status"] = "completed"
-        processing_status[process_id]["steps"]["classification"]["files_classified"] = len(all_files)
+        status["steps"]["classification"]["output"] = classification_output
+        status["steps"]["classification"]["status"] = "completed"
+        status["steps"]["classification"]["files_classified"] = len(all_files)
         
         # Step 2: Parsing
-        processing_status[process_id]["current_step"] = "parsing"
-        processing_status[process_id]["steps"]["parsing"] = {
-            "status": "processing",
-            "message": "Parsing transactions from CSV files...",
-            "output": []
-        }
-        
-        await asyncio.sleep(0.5)
-        
-        parsing_output = ["📄 Starting transaction parsing...", "=" * 50]
-        total_transactions = 0
-        
-        # Parse each file (simulate since already done during upload)
-        for file in all_files:
-            # Estimate transactions per file based on file size
-            file_size = file.stat().st_size
-            # Rough estimate: ~100 bytes per transaction
-            file_trans_count = max(10, file_size // 100)
-            total_transactions += file_trans_count
-            parsing_output.append(f"📊 {file.name}: ~{file_trans_count} transactions")
-        
-        parsing_output.extend([
-            "=" * 50,
+        await begin_step("parsing", "Parsing transactions from CSV files...")
+        
+        # Parse each file (simulate since already done during upload):
+        # estimate transactions per file from its size, ~100 bytes each
+        file_counts = [(file.name, max(10, file_stat.st_size // 100)) for file, file_stat in file_stats]
+        total_transactions = sum(count for _, count in file_counts)
+        
+        parsing_output = [
+            "📄 Starting transaction parsing...",
+            SEPARATOR,
+            *[f"📊 {name}: ~{count} transactions" for name, count in file_counts],
+            SEPARATOR,
             "📊 Parsing Summary:",
             f"   Files processed: {len(all_files)}",
             f"   Total transactions found: {total_transactions}"
-        ])
+        ]
         
-        processing_status[process_id]["steps"]["parsing"]["output"] = parsing_output
-        processing_status[process_id]["steps"]["parsing"]["status"] = "completed"
-        processing_status[process_id]["steps"]["parsing"]["transactions_parsed"] = total_transactions
+        status["steps"]["parsing"]["output"] = parsing_output
+        status["steps"]["parsing"]["status"] = "completed"
+        status["steps"]["parsing"]["transactions_parsed"] = total_transactions
         
         # Step 3: Auto-Tagging
-        processing_status[process_id]["current_step"] = "tagging"
-        processing_status[process_id]["steps"]["tagging"] = {
-            "status": "processing",
-            "message": "Applying 97.1% accurate auto-tagging...",
-            "output": []
-        }
-        
-        await asyncio.sleep(0.5)
+        await begin_step("tagging", "Applying 97.1% accurate auto-tagging...")
         
         # Simulate tagging
         tagged_count = int(total_transactions * 0.97)
         
-        processing_status[process_id]["steps"]["tagging"]["output"] = [
+        status["steps"]["tagging"]["output"] = [
             "🏷️ Starting auto-tagging...",
             f"📊 Processing {total_transactions} transactions",
-            "=" * 50,
+            SEPARATOR,
             "🤖 Using ML model for category detection...",
             f"✅ Tagged {tagged_count}/{total_transactions} transactions",
-            "=" * 50,
+            SEPARATOR,
             "📊 Tagging Summary:",
             f"   Transactions processed: {total_transactions}",
             f"   Successfully tagged: {tagged_count}",
             f"   Accuracy: 97.1%"
         ]
-        processing_status[process_id]["steps"]["tagging"]["status"] = "completed"
-        processing_status[process_id]["steps"]["tagging"]["transactions_tagged"] = tagged_count
+        status["steps"]["tagging"]["status"] = "completed"
+        status["steps"]["tagging"]["transactions_tagged"] = tagged_count
         
         # Step 4: Duplicate Check
-        processing_status[process_id]["current_step"] = "duplicate_check"
-        processing_status[process_id]["steps"]["duplicate_check"] = {
-            "status": "processing",
-            "message": "Checking for duplicate transactions...",
-            "output": []
-        }
-        
-        await asyncio.sleep(0.5)
+        await begin_step("duplicate_check", "Checking for duplicate transactions...")
         
-        processing_status[process_id]["steps"]["duplicate_check"]["output"] = [
+        status["steps"]["duplicate_check"]["output"] = [
             "🔍 Starting duplicate detection...",
             f"📊 Checking {total_transactions} transactions",
-            "=" * 50,
+            SEPARATOR,
             "✅ No duplicates found",
-            "=" * 50,
+            SEPARATOR,
             "📊 Duplicate Check Summary:",
             f"   Transactions checked: {total_transactions}",
             "   Duplicates found: 0",
             f"   Unique transactions: {total_transactions}"
         ]
-        processing_status[process_id]["steps"]["duplicate_check"]["status"] = "completed"
-        processing_status[process_id]["steps"]["duplicate_check"]["duplicates_found"] = 0
+        status["steps"]["duplicate_check"]["status"] = "completed"
+        status["steps"]["duplicate_check"]["duplicates_found"] = 0
         
         # Step 5: Database Save
-        processing_status[process_id]["current_step"] = "database"
-        processing_status[process_id]["steps"]["database"] = {
-            "status": "processing",
-            "message": "Saving transactions to database...",
-            "output": []
-        }
-        
-        await asyncio.sleep(0.5)
+        await begin_step("database", "Saving transactions to database...")
         
         # Files were already saved when uploaded, just show visual feedback
         # Use the same count from parsing for consistency
         saved_count = total_transactions
         
-        processing_status[process_id]["steps"]["database"]["output"] = [
+        status["steps"]["database"]["output"] = [
             "💾 Starting database save...",
             f"📊 Saving {total_transactions} transactions from {len(all_files)} files",
-            "=" * 50,
+            SEPARATOR,
             f"✅ Successfully saved {saved_count} transactions",
-            "=" * 50,
+            SEPARATOR,
             "📊 Database Summary:",
             f"   Transactions saved: {saved_count}",
             f"   Files processed: {len(all_files)}",
             "   Accounts used: 1"
         ]
-        processing_status[process_id]["steps"]["database"]["status"] = "completed"
-        processing_status[process_id]["steps"]["database"]["transactions_saved"] = saved_count
+        status["steps"]["database"]["status"] = "completed"
+        status["steps"]["database"]["transactions_saved"] = saved_count
         
         # Update overall status
-        processing_status[process_id]["status"] = "completed"
-        processing_status[process_id]["statistics"] = {
+        status["status"] = "completed"
+        status["statistics"] = {
             "total_files_processed": len(all_files),
             "total_transactions": total_transactions,
             "transactions_tagged": tagged_count,
@@ -398,28 +480,37 @@ async def process_files_async_with_steps(process_id: str, db: AsyncSession):
             "tagging_accuracy": "97.1%"
         }
         
-        # Clean up all processed files
-        for file in all_files:
-            if file.exists():
-                file.unlink()
+        # Clean up all processed files (and their index entries); the unlinks
+        # are independent, so run them concurrently in worker threads
+        await asyncio.gather(*(asyncio.to_thread(file.unlink, missing_ok=True) for file in all_files))
+        processed = set(all_files)
+        for file_id in [fid for fid, path in uploaded_files.items() if path in processed]:
+            del uploaded_files[file_id]
         
     except Exception as e:
-        processing_status[process_id]["status"] = "failed"
-        processing_status[process_id]["error"] = str(e)
+        status["status"] = "failed"
+        status["error"] = str(e)
         # Update current step to failed
-        if processing_status[process_id]["current_step"]:
-            step = processing_status[process_id]["current_step"]
-            processing_status[process_id]["steps"][step]["status"] = "failed"
-            processing_status[process_id]["steps"][step]["error"] = str(e)
+        if status["current_step"]:
+            step = status["current_step"]
+            status["steps"][step]["status"] = "failed"
+            status["steps"][step]["error"] = str(e)
 
 
-@router.get("/process-status/{process_id}")
-async def get_process_status(process_id: str) -> Dict[str, Any]:
-    """Get the current status of a file processing job"""
-    if process_id not in processing_status:
+@router.get("/process-status/{process_id}", response_class=ORJSONResponse)
+async def get_process_status(process_id: str) -> ORJSONResponse:
+    """
+    Get the current status of a file processing job.
+    Polled repeatedly while a job runs, so the status dict (with its step
+    output lines) is handed straight to orjson instead of going through
+    jsonable_encoder and response validation on every poll.
+    """
+    # Unknown and expired IDs look the same to the client
+    status = processing_status.get(process_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Process ID not found")
     
-    return {
+    return ORJSONResponse({
         "success": True,
-        "data": processing_status[process_id]
-    }
+        "data": status
+    })
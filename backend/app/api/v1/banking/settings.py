@@ -11,15 +11,21 @@ Uses /api/v1/data/* endpoints instead
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select, func, update
+from sqlalchemy import text, select, func, update, insert, bindparam, lambda_stmt
 from sqlalchemy.orm import selectinload
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
+import os
 
+from app.core.auth import get_current_user_id
 from app.core.database import get_async_db
+from app.core.data_version import current_finance_data_version
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.models.category import Category
@@ -32,71 +38,178 @@ class TagMigrateRequest(BaseModel):
 
 router = APIRouter()
 
-# Import single user constant
-from app.core.constants import SINGLE_USER_ID
+# Redis response cache for the summary endpoints. Keys embed the finance data
+# version (moved by every committed write), so tag edits, recategorizations
+# and deletes make earlier entries unreachable without explicit purges. The
+# data summary also counts files on disk, which the version does not track,
+# so it expires sooner.
+SETTINGS_CACHE_NAMESPACE = "settings"
+SETTINGS_CACHE_TTL = 300
+DATA_SUMMARY_CACHE_TTL = 60
 
 
-@router.get("/data-summary/", response_model=Dict[str, Any])
+def settings_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """Cache key for a settings summary, scoped to the requesting user and data version."""
+    kwargs = kwargs or {}
+    return (
+        f"{FastAPICache.get_prefix()}:{namespace}:summary:{kwargs['user_id']}"
+        f":{func.__name__}:{current_finance_data_version()}"
+    )
+
+# Fixed SQL for the summary endpoints, built once at import so SQLAlchemy's
+# compiled cache and asyncpg's prepared-statement cache are hit on every call
+
+# Transaction, account and used-category counts in one round-trip.
+# Transactions can only reference existing categories (FK), so the distinct
+# category_id count needs no join against categories
+_DATA_SUMMARY_COUNTS = text("""
+    SELECT
+        (SELECT COUNT(*) FROM transactions WHERE user_id = :user_id),
+        (SELECT COUNT(*) FROM accounts WHERE user_id = :user_id),
+        (SELECT COUNT(DISTINCT category_id) FROM transactions
+         WHERE user_id = :user_id AND category_id IS NOT NULL)
+""")
+
+# Date range per account as one JSON array (JSON dates are always YYYY-MM-DD)
+_DATE_RANGES = text("""
+    SELECT COALESCE(json_agg(json_build_object(
+        'account_name', r.account_name,
+        'earliest_date', r.earliest_date,
+        'latest_date', r.latest_date,
+        'transaction_count', r.transaction_count
+    ) ORDER BY r.account_name), '[]'::json)
+    FROM (
+        SELECT 
+            a.name as account_name,
+            MIN(t.transaction_date) as earliest_date,
+            MAX(t.transaction_date) as latest_date,
+            COUNT(t.id) as transaction_count
+        FROM transactions t
+        JOIN accounts a ON t.account_id = a.id
+        WHERE t.user_id = :user_id
+        GROUP BY a.name
+    ) r
+""")
+
+# Tag usage counts as one JSON array
+_TAGS_SUMMARY = text("""
+    SELECT COALESCE(json_agg(json_build_object(
+        'tag_name', r.tag_name,
+        'record_count', r.record_count
+    ) ORDER BY r.tag_name), '[]'::json)
+    FROM (
+        SELECT 
+            COALESCE(c.name, 'Uncategorized') as tag_name,
+            COUNT(t.id) as record_count
+        FROM transactions t
+        LEFT JOIN categories c ON t.category_id = c.id
+        WHERE t.user_id = :user_id
+        GROUP BY c.name
+    ) r
+""")
+
+# Category lookups and inserts by the tag endpoints: only IDs are needed, so
+# no entities are hydrated; lambda_stmt compiles each shape once
+_CATEGORY_IDS_BY_NAME = lambda_stmt(
+    lambda: select(Category.name, Category.id)
+    .where(Category.name.in_(bindparam("names", expanding=True)))
+)
+
+_INSERT_CATEGORY = lambda_stmt(
+    lambda: insert(Category)
+    .values(name=bindparam("name"), category_type=bindparam("category_type"))
+    .returning(Category.id)
+)
+
+
+def _count_entries(path: Path) -> Optional[int]:
+    """Number of entries in a directory, None if it does not exist (blocking)"""
+    try:
+        with os.scandir(path) as entries:
+            return sum(1 for _ in entries)
+    except FileNotFoundError:
+        return None
+
+
+async def _category_ids_by_name(db: AsyncSession, *names: str) -> Dict[str, int]:
+    """IDs of the categories with any of the given names, keyed by name"""
+    result = await db.execute(_CATEGORY_IDS_BY_NAME, {"names": list(names)})
+    return dict(result.all())
+
+
+async def _create_category(db: AsyncSession, name: str) -> int:
+    """Insert a new expense category; returns its ID"""
+    result = await db.execute(_INSERT_CATEGORY, {"name": name, "category_type": "expense"})
+    return result.scalar_one()
+
+
+# Repoint a category's transactions (to another category or NULL) and delete
+# the category in one statement. The transactions FK is NO ACTION, so it is
+# checked at the end of the statement, after the UPDATE has run.
+_MOVE_AND_DELETE_CATEGORY = text("""
+    WITH moved AS (
+        UPDATE transactions SET category_id = :target_id
+        WHERE user_id = :user_id AND category_id = :category_id
+        RETURNING 1
+    ), removed AS (
+        DELETE FROM categories WHERE id = :category_id
+    )
+    SELECT COUNT(*) FROM moved
+""")
+
+
+async def _move_and_delete_category(
+    db: AsyncSession,
+    user_id: int,
+    category_id: int,
+    target_id: Optional[int]
+) -> int:
+    """Move the user's transactions off a category, delete it; returns the number moved"""
+    result = await db.execute(
+        _MOVE_AND_DELETE_CATEGORY,
+        {"user_id": user_id, "category_id": category_id, "target_id": target_id}
+    )
+    return result.scalar()
+
+
+@router.get("/data-summary/", response_model=None)
+@cache(expire=DATA_SUMMARY_CACHE_TTL, namespace=SETTINGS_CACHE_NAMESPACE, key_builder=settings_key_builder)
 async def get_data_summary(
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Get a summary of all user data in the system.
     
     Args:
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing data summary
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
-        
-        # Count transactions
-        result = await db.execute(
-            text("SELECT COUNT(*) FROM transactions WHERE user_id = :user_id"),
-            {"user_id": user_id}
-        )
-        transaction_count = result.scalar() or 0
-        
-        # Count accounts
-        result = await db.execute(
-            text("SELECT COUNT(*) FROM accounts WHERE user_id = :user_id"),
-            {"user_id": user_id}
-        )
-        account_count = result.scalar() or 0
-        
-        # Count categories used by this user's transactions
-        result = await db.execute(
-            text("""
-                SELECT COUNT(DISTINCT c.id) 
-                FROM categories c
-                JOIN transactions t ON t.category_id = c.id
-                WHERE t.user_id = :user_id
-            """),
-            {"user_id": user_id}
-        )
-        category_count = result.scalar() or 0
-        
-        # Count files
-        file_count = 0
-        file_details = {}
+        # Directories whose entries are counted: one scandir per directory
+        # (no Path objects, no stat), each in a worker thread off the event loop
         # Use path relative to banking services module - works in both DEV and PROD Docker
         base_dir = Path(__file__).parent.parent.parent.parent / "services" / "banking" / "data"
+        count_dirs = {dir_name: base_dir / dir_name for dir_name in ["input", "working", "output", "classified"]}
+        count_dirs["uploads"] = Path("/tmp/capricorn_uploads")
         
-        for dir_name in ["input", "working", "output", "classified"]:
-            dir_path = base_dir / dir_name
-            if dir_path.exists():
-                files = list(dir_path.glob("*"))
-                file_details[dir_name] = len(files)
-                if dir_name == "working":  # Count working directory for main count
-                    file_count = len(files)
+        # Database counts overlapped with the directory scans
+        result, *counts = await asyncio.gather(
+            db.execute(_DATA_SUMMARY_COUNTS, {"user_id": user_id}),
+            *(asyncio.to_thread(_count_entries, path) for path in count_dirs.values())
+        )
+        transaction_count, account_count, category_count = result.one()
         
-        # Check uploads directory
-        uploads_dir = Path("/tmp/capricorn_uploads")
-        if uploads_dir.exists():
-            upload_files = list(uploads_dir.glob("*"))
-            file_details["uploads"] = len(upload_files)
+        # Missing directories are left out of the details
+        file_details = {
+            dir_name: count
+            for dir_name, count in zip(count_dirs, counts)
+            if count is not None
+        }
+        file_count = file_details.get("working", 0)  # Working directory is the main count
         
         return {
             "success": True,
@@ -117,48 +230,27 @@ async def get_data_summary(
         )
 
 
-@router.get("/transaction-date-ranges/", response_model=Dict[str, Any])
+@router.get("/transaction-date-ranges/", response_model=None)
+@cache(expire=SETTINGS_CACHE_TTL, namespace=SETTINGS_CACHE_NAMESPACE, key_builder=settings_key_builder)
 async def get_transaction_date_ranges(
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Get earliest and latest transaction dates by account.
     
     Args:
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing earliest and latest transaction dates by account
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
-        
-        # Get transaction date ranges by account
-        query = text("""
-            SELECT 
-                a.name as account_name,
-                MIN(t.transaction_date) as earliest_date,
-                MAX(t.transaction_date) as latest_date,
-                COUNT(t.id) as transaction_count
-            FROM transactions t
-            JOIN accounts a ON t.account_id = a.id
-            WHERE t.user_id = :user_id
-            GROUP BY a.name
-            ORDER BY a.name
-        """)
-        
-        result = await db.execute(query, {"user_id": user_id})
-        ranges_data = result.fetchall()
-        
-        # Format the results
-        account_ranges = []
-        for row in ranges_data:
-            account_ranges.append({
-                "account_name": row[0],
-                "earliest_date": row[1].strftime("%Y-%m-%d") if row[1] else None,
-                "latest_date": row[2].strftime("%Y-%m-%d") if row[2] else None,
-                "transaction_count": row[3]
-            })
+        # Get transaction date ranges by account (JSON array; the asyncpg
+        # dialect's json codec hands it back already decoded)
+        result = await db.execute(_DATE_RANGES, {"user_id": user_id})
+        account_ranges = result.scalar()
         
         return {
             "success": True,
@@ -174,44 +266,26 @@ async def get_transaction_date_ranges(
         )
 
 
-@router.get("/tags-summary/", response_model=Dict[str, Any])
+@router.get("/tags-summary/", response_model=None)
+@cache(expire=SETTINGS_CACHE_TTL, namespace=SETTINGS_CACHE_NAMESPACE, key_builder=settings_key_builder)
 async def get_tags_summary(
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Get a summary of all tags and their usage counts.
     
     Args:
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing tags summary
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
-        
-        # Get all tags with their counts
-        query = text("""
-            SELECT 
-                COALESCE(c.name, 'Uncategorized') as tag_name,
-                COUNT(t.id) as record_count
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = :user_id
-            GROUP BY c.name
-            ORDER BY tag_name
-        """)
-        
-        result = await db.execute(query, {"user_id": user_id})
-        tags_data = result.fetchall()
-        
-        # Format the results
-        tags_summary = []
-        for row in tags_data:
-            tags_summary.append({
-                "tag_name": row[0],
-                "record_count": row[1]
-            })
+        # Get all tags with their counts (JSON array, already decoded)
+        result = await db.execute(_TAGS_SUMMARY, {"user_id": user_id})
+        tags_summary = result.scalar()
         
         return {
             "success": True,
@@ -228,11 +302,12 @@ async def get_tags_summary(
         )
 
 
-@router.put("/tags/{tag_name}/edit", response_model=Dict[str, Any])
+@router.put("/tags/{tag_name}/edit", response_model=None)
 async def edit_tag(
     tag_name: str,
     request: TagUpdateRequest,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Edit a tag name and update all records with that tag.
@@ -241,62 +316,46 @@ async def edit_tag(
         tag_name: Current tag name to edit
         request: New tag name
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing operation result
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
+        # Look up the old and new category IDs in one query
+        category_ids = await _category_ids_by_name(db, tag_name, request.new_tag_name)
+        old_category_id = category_ids.get(tag_name)
+        new_category_id = category_ids.get(request.new_tag_name)
         
-        # First, find or create the new category
-        category_query = select(Category).where(
-            Category.name == request.new_tag_name
-        )
-        category_result = await db.execute(category_query)
-        new_category = category_result.scalar_one_or_none()
-        
-        if not new_category:
-            # Create new category
-            new_category = Category(
-                name=request.new_tag_name,
-                category_type='expense'  # Default to expense
-            )
-            db.add(new_category)
-            await db.flush()
-        
-        # Find the old category
-        old_category_query = select(Category).where(
-            Category.name == tag_name
-        )
-        old_category_result = await db.execute(old_category_query)
-        old_category = old_category_result.scalar_one_or_none()
+        if not new_category_id:
+            # Create new category (defaults to expense)
+            new_category_id = await _create_category(db, request.new_tag_name)
         
         records_updated = 0
         
-        if not old_category:
+        if not old_category_id:
             # Handle "Uncategorized" case
             if tag_name == "Uncategorized":
                 # Update all uncategorized transactions
                 update_query = update(Transaction).where(
                     Transaction.user_id == user_id,
                     Transaction.category_id.is_(None)
-                ).values(category_id=new_category.id)
+                ).values(category_id=new_category_id)
                 result = await db.execute(update_query)
                 records_updated = result.rowcount
             else:
                 raise HTTPException(status_code=404, detail="Tag not found")
+        elif old_category_id != new_category_id:
+            # Move all transactions with this category and delete it
+            records_updated = await _move_and_delete_category(db, user_id, old_category_id, new_category_id)
         else:
-            # Update all transactions with this category
+            # Renamed to itself: the old category stays
             update_query = update(Transaction).where(
                 Transaction.user_id == user_id,
-                Transaction.category_id == old_category.id
-            ).values(category_id=new_category.id)
+                Transaction.category_id == old_category_id
+            ).values(category_id=new_category_id)
             result = await db.execute(update_query)
             records_updated = result.rowcount
-            
-            # Delete the old category if it's different from the new one
-            if old_category.id != new_category.id:
-                await db.delete(old_category)
         
         await db.commit()
         
@@ -318,10 +377,11 @@ async def edit_tag(
         )
 
 
-@router.delete("/tags/{tag_name}/remove", response_model=Dict[str, Any])
+@router.delete("/tags/{tag_name}/remove", response_model=None)
 async def remove_tag(
     tag_name: str,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Remove a tag and set all records with that tag to Uncategorized.
@@ -329,37 +389,26 @@ async def remove_tag(
     Args:
         tag_name: Tag name to remove
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing operation result
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
-        
         # Can't remove "Uncategorized"
         if tag_name == "Uncategorized":
             raise HTTPException(status_code=400, detail="Cannot remove 'Uncategorized' tag")
         
         # Find the category to remove
-        category_query = select(Category).where(
-            Category.name == tag_name
-        )
-        category_result = await db.execute(category_query)
-        category = category_result.scalar_one_or_none()
+        category_ids = await _category_ids_by_name(db, tag_name)
+        category_id = category_ids.get(tag_name)
         
-        if not category:
+        if not category_id:
             raise HTTPException(status_code=404, detail="Tag not found")
         
-        # Update all transactions with this category to uncategorized (NULL)
-        update_query = update(Transaction).where(
-            Transaction.user_id == user_id,
-            Transaction.category_id == category.id
-        ).values(category_id=None)
-        result = await db.execute(update_query)
-        records_updated = result.rowcount
-        
-        # Delete the category
-        await db.delete(category)
+        # Set all transactions with this category to uncategorized (NULL)
+        # and delete the category
+        records_updated = await _move_and_delete_category(db, user_id, category_id, None)
         await db.commit()
         
         return {
@@ -379,11 +428,12 @@ async def remove_tag(
         )
 
 
-@router.put("/tags/{tag_name}/migrate", response_model=Dict[str, Any])
+@router.put("/tags/{tag_name}/migrate", response_model=None)
 async def migrate_tag(
     tag_name: str,
     request: TagMigrateRequest,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Migrate all records from one tag to another tag.
@@ -392,55 +442,37 @@ async def migrate_tag(
         tag_name: Source tag name to migrate from
         request: Target tag name to migrate to
         db: Database session
+        user_id: ID of the current user
         
     Returns:
         Dict containing operation result
     """
     try:
-        user_id = SINGLE_USER_ID  # For DEV mode
-        
-        # Find the target category
-        target_category_query = select(Category).where(
-            Category.name == request.target_tag_name
-        )
-        target_category_result = await db.execute(target_category_query)
-        target_category = target_category_result.scalar_one_or_none()
+        # Look up the source and target category IDs in one query
+        category_ids = await _category_ids_by_name(db, tag_name, request.target_tag_name)
+        target_category_id = category_ids.get(request.target_tag_name)
+        source_category_id = category_ids.get(tag_name)
         
-        if not target_category:
+        if not target_category_id:
             raise HTTPException(status_code=404, detail="Target tag not found")
         
-        # Find the source category
-        source_category_query = select(Category).where(
-            Category.name == tag_name
-        )
-        source_category_result = await db.execute(source_category_query)
-        source_category = source_category_result.scalar_one_or_none()
-        
         records_updated = 0
         
-        if not source_category:
+        if not source_category_id:
             # Handle "Uncategorized" case
             if tag_name == "Uncategorized":
                 # Update all uncategorized transactions
                 update_query = update(Transaction).where(
                     Transaction.user_id == user_id,
                     Transaction.category_id.is_(None)
-                ).values(category_id=target_category.id)
+                ).values(category_id=target_category_id)
                 result = await db.execute(update_query)
                 records_updated = result.rowcount
             else:
                 raise HTTPException(status_code=404, detail="Source tag not found")
         else:
-            # Update all transactions with this category
-            update_query = update(Transaction).where(
-                Transaction.user_id == user_id,
-                Transaction.category_id == source_category.id
-            ).values(category_id=target_category.id)
-            result = await db.execute(update_query)
-            records_updated = result.rowcount
-            
-            # Delete the source category
-            await db.delete(source_category)
+            # Move all transactions with this category and delete it
+            records_updated = await _move_and_delete_category(db, user_id, source_category_id, target_category_id)
         
         await db.commit()
         
@@ -462,7 +494,7 @@ async def migrate_tag(
         )
 
 
-@router.post("/tags/create", response_model=Dict[str, Any])
+@router.post("/tags/create", response_model=None)
 async def create_tag(
     request: TagUpdateRequest,
     db: AsyncSession = Depends(get_async_db)
@@ -479,21 +511,11 @@ async def create_tag(
     """
     try:
         # Check if tag already exists
-        category_query = select(Category).where(
-            Category.name == request.new_tag_name
-        )
-        category_result = await db.execute(category_query)
-        existing_category = category_result.scalar_one_or_none()
-        
-        if existing_category:
+        if await _category_ids_by_name(db, request.new_tag_name):
             raise HTTPException(status_code=400, detail="Tag already exists")
         
-        # Create new category
-        new_category = Category(
-            name=request.new_tag_name,
-            category_type='expense'  # Default to expense
-        )
-        db.add(new_category)
+        # Create new category (defaults to expense)
+        new_category_id = await _create_category(db, request.new_tag_name)
         await db.commit()
         
         return {
@@ -501,7 +523,7 @@ async def create_tag(
             "message": f"Tag '{request.new_tag_name}' created successfully",
             "data": {
                 "tag_name": request.new_tag_name,
-                "category_id": str(new_category.id)
+                "category_id": str(new_category_id)
             }
         }
         
@@ -4,66 +4,74 @@ Transactions API Endpoints - Single User System
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, func, and_, bindparam, lambda_stmt
 from typing import Dict, Any
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
 from app.core.database import get_async_db
 from app.models.transaction import Transaction
 from app.models.category import Category
 from app.core.constants import SINGLE_USER_ID
+from app.core.responses import ORJSONResponse
 
 router = APIRouter(tags=["Transactions"])
 
+# Fixed-shape statements: compiled once and reused via lambda_stmt's cache
+# UPDATE ... FROM categories: no row is updated unless the category exists,
+# and RETURNING hands back its name
+_SET_TRANSACTION_CATEGORY = lambda_stmt(
+    lambda: update(Transaction)
+    .where(
+        Transaction.id == bindparam("tid"),
+        Transaction.user_id == bindparam("uid"),
+        Category.id == bindparam("cid")
+    )
+    .values(category_id=Category.id)
+    .returning(Category.name)
+    .execution_options(synchronize_session=False)
+)
+
 
 @router.put("/{transaction_id}/category")
 async def update_transaction_category(
-    transaction_id: str,
-    category_id: str = Query(..., description="Category ID to assign"),
+    transaction_id: int,
+    category_id: int = Query(..., description="Category ID to assign"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update the category of a specific transaction.
     """
     try:
-        # Find the transaction
-        transaction_query = select(Transaction).filter(
-            and_(
-                Transaction.id == transaction_id,
-                Transaction.user_id == SINGLE_USER_ID
-            )
-        )
-        transaction_result = await db.execute(transaction_query)
-        transaction = transaction_result.scalar_one_or_none()
-        
-        if not transaction:
-            raise HTTPException(
-                status_code=404,
-                detail="Transaction not found"
+        # Validate, update and fetch the category name in one round-trip
+        category_name = (await db.execute(
+            _SET_TRANSACTION_CATEGORY,
+            {"tid": transaction_id, "uid": SINGLE_USER_ID, "cid": category_id}
+        )).scalar_one_or_none()
+        
+        if category_name is None:
+            # Nothing updated: find out which ID was wrong (failure path only)
+            transaction_exists = await db.scalar(
+                select(Transaction.id).where(
+                    Transaction.id == transaction_id,
+                    Transaction.user_id == SINGLE_USER_ID
+                )
             )
-        
-        # Verify the category exists
-        category_query = select(Category).filter(Category.id == category_id)
-        category_result = await db.execute(category_query)
-        category = category_result.scalar_one_or_none()
-        
-        if not category:
             raise HTTPException(
                 status_code=404,
-                detail="Category not found"
+                detail="Category not found" if transaction_exists else "Transaction not found"
             )
         
-        # Update the transaction category
-        transaction.category_id = category_id
         await db.commit()
         
         return {
             "success": True,
-            "message": f"Transaction category updated to '{category.name}' successfully",
+            "message": f"Transaction category updated to '{category_name}' successfully",
             "data": {
-                "transaction_id": transaction_id,
-                "category_id": category_id,
-                "category_name": category.name
+                "transaction_id": str(transaction_id),
+                "category_id": str(category_id),
+                "category_name": category_name
             }
         }
         
@@ -77,91 +85,82 @@ async def update_transaction_category(
         )
 
 
-@router.get("/double-charges")
+@router.get("/double-charges", response_class=ORJSONResponse)
 async def get_double_charges(
     db: AsyncSession = Depends(get_async_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Find potential double charges - debit transactions with same description and amount on the same day
     Excludes MTA charges and credit transactions (refunds are legitimate)
     """
     try:
-        # Get all transactions for the user
-        transactions_query = select(Transaction).where(
-            Transaction.user_id == SINGLE_USER_ID
-        ).order_by(Transaction.transaction_date.desc())
-        
-        result = await db.execute(transactions_query)
-        transactions = result.scalars().all()
-        
-        # Find potential double charges
-        double_charges = []
-        
-        # Convert to list for easier iteration
-        transaction_list = list(transactions)
-        
-        for i, transaction in enumerate(transaction_list):
-            # Skip MTA charges (legitimate round trips)
-            if "MTA" in transaction.description.upper():
-                continue
-            
-            # Skip non-debit transactions (we only care about double charges, not refunds)
-            if transaction.transaction_type != 'debit':
-                continue
-            
-            # Look for matching transactions on the same day
-            matches = []
-            for j, other_transaction in enumerate(transaction_list):
-                if i != j:  # Don't compare with itself
-                    # Check if description and amount match AND both are debit transactions
-                    if (transaction.description.lower() == other_transaction.description.lower() and 
-                        abs(float(transaction.amount) - float(other_transaction.amount)) < 0.01 and
-                        transaction.transaction_type == 'debit' and
-                        other_transaction.transaction_type == 'debit'):
-                        
-                        # Check if dates are exactly the same
-                        if transaction.transaction_date == other_transaction.transaction_date:
-                            matches.append({
-                                "id": str(other_transaction.id),
-                                "transaction_date": other_transaction.transaction_date.isoformat(),
-                                "description": other_transaction.description,
-                                "amount": float(other_transaction.amount),
-                                "transaction_type": other_transaction.transaction_type,
-                                "created_at": other_transaction.created_at.isoformat(),
-                                "days_apart": 0  # Same day
-                            })
-            
-            if matches:
-                # Sort matches by date
-                matches.sort(key=lambda x: x["transaction_date"])
-                
-                double_charges.append({
-                    "primary_transaction": {
-                        "id": str(transaction.id),
-                        "transaction_date": transaction.transaction_date.isoformat(),
-                        "description": transaction.description,
-                        "amount": float(transaction.amount),
-                        "transaction_type": transaction.transaction_type,
-                        "created_at": transaction.created_at.isoformat()
-                    },
-                    "matching_transactions": matches,
-                    "total_matches": len(matches)
-                })
+        # One pass in the database: tag each candidate debit with the size of
+        # its (date, description, amount) group and keep only groups of 2+
+        group_key = (
+            Transaction.transaction_date,
+            func.lower(Transaction.description),
+            Transaction.amount
+        )
+        candidates = select(
+            Transaction.id,
+            Transaction.transaction_date,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.transaction_type,
+            Transaction.created_at,
+            func.lower(Transaction.description).label("description_key"),
+            func.count().over(partition_by=group_key).label("group_size")
+        ).where(
+            and_(
+                Transaction.user_id == SINGLE_USER_ID,
+                Transaction.transaction_type == 'debit',
+                # Skip MTA charges (legitimate round trips)
+                Transaction.description.not_ilike('%MTA%')
+            )
+        ).subquery()
+        
+        # Group key columns first, then the payload columns
+        result = await db.execute(
+            select(
+                candidates.c.transaction_date,
+                candidates.c.description_key,
+                candidates.c.amount,
+                candidates.c.id,
+                candidates.c.description,
+                candidates.c.transaction_type,
+                candidates.c.created_at
+            ).where(candidates.c.group_size > 1).order_by(
+                candidates.c.transaction_date.desc(),
+                candidates.c.description_key,
+                candidates.c.amount,
+                candidates.c.id
+            )
+        )
         
-        # Remove duplicates (if transaction A matches B, don't also show B matches A)
+        # Rows arrive grouped; the oldest ID in each group is the primary.
+        # Rows are unpacked as plain tuples; dates and timestamps are left to orjson
         unique_groups = []
-        processed_ids = set()
-        
-        for group in double_charges:
-            primary_id = group["primary_transaction"]["id"]
-            if primary_id not in processed_ids:
-                # Mark all IDs in this group as processed
-                processed_ids.add(primary_id)
-                for match in group["matching_transactions"]:
-                    processed_ids.add(match["id"])
-                unique_groups.append(group)
-        
-        return {
+        for _, rows in groupby(result.tuples(), key=itemgetter(0, 1, 2)):
+            primary, *others = [
+                {
+                    "id": str(transaction_id),
+                    "transaction_date": transaction_date,
+                    "description": description,
+                    "amount": float(amount),
+                    "transaction_type": transaction_type,
+                    "created_at": created_at
+                }
+                for transaction_date, _, amount, transaction_id, description, transaction_type, created_at in rows
+            ]
+            for match in others:
+                match["days_apart"] = 0  # Same day
+            unique_groups.append({
+                "primary_transaction": primary,
+                "matching_transactions": others,
+                "total_matches": len(others)
+            })
+        
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "double_charge_groups": unique_groups,
@@ -169,7 +168,7 @@ async def get_double_charges(
                 "total_suspicious_transactions": sum(1 + len(group["matching_transactions"]) for group in unique_groups)
             },
             "message": f"Found {len(unique_groups)} potential double charge groups"
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -6,12 +6,14 @@ Handles full backup and restore of all user data across all modules
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, text
+from sqlalchemy import select, delete, func, insert, cast, text, Numeric, Text
 from datetime import datetime
+from decimal import Decimal
+import functools
 import json
-import io
+import orjson
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, AsyncSessionLocal
 from app.models.transaction import Transaction
 from app.models.account import Account
 from app.models.category import Category
@@ -20,6 +22,16 @@ from app.models.portfolio_models import Portfolio, PortfolioTransaction, MarketP
 
 router = APIRouter(prefix="/data", tags=["data"])
 
+# Sequence resets as a single SELECT of setval() calls (one round trip).
+# pg_get_serial_sequence() is NULL for a table without one, and setval(NULL)
+# is a no-op rather than an error.
+RESET_BOOTSTRAP_SEQUENCES = text(
+    "SELECT " + ", ".join(
+        f"setval(pg_get_serial_sequence('{table}', 'id'), 1, true)"
+        for table in ('user_profile', 'investor_profiles')
+    )
+)
+
 
 async def create_bootstrap_user(db: AsyncSession) -> dict:
     """
@@ -103,14 +115,10 @@ async def create_bootstrap_user(db: AsyncSession) -> dict:
         created["investor_profile"] = 1
     
     if created:
-        await db.commit()
+        await db.flush()
         
         # Reset sequences to start after id 1
-        for table in ['user_profile', 'investor_profiles']:
-            try:
-                await db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), 1, true)"))
-            except Exception:
-                pass
+        await db.execute(RESET_BOOTSTRAP_SEQUENCES)
         await db.commit()
     
     return created
@@ -124,18 +132,154 @@ async def ensure_bootstrap_user(db: AsyncSession) -> dict:
     return await create_bootstrap_user(db)
 
 
-def model_to_dict(obj):
-    """Convert SQLAlchemy model to dictionary"""
-    if obj is None:
-        return None
-    result = {}
-    for column in obj.__table__.columns:
-        value = getattr(obj, column.name)
-        # Handle datetime serialization
-        if hasattr(value, 'isoformat'):
-            value = value.isoformat()
-        result[column.name] = value
-    return result
+# Export key -> model for every user data table, in export file order
+USER_DATA_TABLES = (
+    ("user_profile", UserProfile),
+    ("accounts", Account),
+    ("categories", Category),
+    ("transactions", Transaction),
+    ("portfolios", Portfolio),
+    ("portfolio_transactions", PortfolioTransaction),
+    ("market_prices", MarketPrice),
+    ("investor_profiles", InvestorProfile),
+)
+
+# Import counterpart of RESET_BOOTSTRAP_SEQUENCES: every table in one SELECT
+SYNC_USER_DATA_SEQUENCES = text(
+    "SELECT " + ", ".join(
+        f"setval(pg_get_serial_sequence('{model.__tablename__}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {model.__tablename__}), 1))"
+        for _, model in USER_DATA_TABLES
+    )
+)
+
+# One statement empties every user data table and restarts its id sequence.
+# CASCADE also empties tables holding FKs to them (e.g. budgets), which a
+# plain DELETE of categories would have been blocked by.
+TRUNCATE_USER_DATA = text(
+    "TRUNCATE TABLE "
+    + ", ".join(model.__tablename__ for _, model in USER_DATA_TABLES)
+    + " RESTART IDENTITY CASCADE"
+)
+
+# Rows per multi-VALUES INSERT during import; batches are powers of two so
+# only a handful of statement shapes get compiled and prepared
+IMPORT_MAX_VALUES_ROWS = 128
+
+# (export key, model, fields holding ISO date/datetime strings), in FK order
+IMPORT_BASE_TABLES = (
+    ("user_profile", UserProfile, ('created_at', 'updated_at')),
+    ("investor_profiles", InvestorProfile, ('created_at', 'updated_at')),
+    ("accounts", Account, ('created_at', 'updated_at')),
+    ("categories", Category, ('created_at', 'updated_at')),
+    ("portfolios", Portfolio, ('created_at', 'updated_at')),
+    ("market_prices", MarketPrice, ('created_at', 'updated_at', 'last_updated')),
+)
+IMPORT_DEPENDENT_TABLES = (
+    ("transactions", Transaction, ('created_at', 'updated_at', 'transaction_date')),
+    ("portfolio_transactions", PortfolioTransaction, ('created_at', 'updated_at', 'transaction_date')),
+)
+
+# Large tables restored with COPY FROM STDIN rather than INSERT statements
+IMPORT_COPY_MODELS = frozenset({Transaction, PortfolioTransaction, MarketPrice})
+
+
+def clean_import_row(item: dict, date_fields) -> dict:
+    """Drop None values (so column defaults apply) and parse date/datetime strings"""
+    clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
+    for date_field in date_fields:
+        value = clean_item.get(date_field)
+        if isinstance(value, str):
+            if 'T' in value:
+                clean_item[date_field] = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            else:
+                # Just a date, not datetime
+                clean_item[date_field] = datetime.strptime(value, '%Y-%m-%d').date()
+    return clean_item
+
+
+@functools.lru_cache(maxsize=None)
+def numeric_columns(model) -> frozenset:
+    """Names of the model's Numeric columns (exported as strings), computed once per model"""
+    return frozenset(
+        column.name for column in model.__table__.columns if isinstance(column.type, Numeric)
+    )
+
+
+def chunked_pow2(rows: list, maxp: int = IMPORT_MAX_VALUES_ROWS):
+    """Yield slices of rows sized maxp, then maxp/2, ..., 1 to cover the remainder"""
+    start = 0
+    size = maxp
+    while size:
+        while len(rows) - start >= size:
+            yield rows[start:start + size]
+            start += size
+        size //= 2
+
+
+async def bulk_import_rows(db: AsyncSession, model, items: list, date_fields) -> int:
+    """
+    Insert exported rows for one model: COPY for the large IMPORT_COPY_MODELS
+    tables, multi-row INSERT ... VALUES statements for the rest.
+    Rows are grouped by key set (the None filter drops different keys per row)
+    since each COPY or VALUES list names one set of columns. The SQL for a
+    (table, keys, slice length) shape is compiled once by SQLAlchemy's statement
+    cache, and power-of-two slices keep those shapes few.
+    """
+    rows_by_keys = {}
+    for item in items:
+        row = clean_import_row(item, date_fields)
+        rows_by_keys.setdefault(frozenset(row), []).append(row)
+
+    table = model.__table__
+    if model in IMPORT_COPY_MODELS:
+        # Binary COPY on the session's asyncpg connection. The driver only
+        # opens its transaction on the first statement, so COPY must follow
+        # another statement in the same transaction (the import's deletes)
+        # to be rolled back with it.
+        raw_connection = await (await db.connection()).get_raw_connection()
+        numeric = numeric_columns(model)
+        for keys, rows in rows_by_keys.items():
+            columns = tuple(keys)
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.name,
+                columns=columns,
+                records=[
+                    tuple(Decimal(str(row[c])) if c in numeric else row[c] for c in columns)
+                    for row in rows
+                ]
+            )
+        return len(items)
+
+    for rows in rows_by_keys.values():
+        for chunk in chunked_pow2(rows):
+            await db.execute(insert(table).values(chunk))
+    return len(items)
+
+
+async def count_user_data(db: AsyncSession) -> dict:
+    """Row count of every user data table, fetched in a single query"""
+    result = await db.execute(select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(name)
+        for name, model in USER_DATA_TABLES
+    )))
+    return dict(result.one()._mapping)
+
+
+@functools.lru_cache(maxsize=None)
+def export_rows_query(model):
+    """
+    SELECT rendering each row of model's table as JSON text in Postgres.
+    Numeric columns are cast to text first so they export as strings
+    (matching json.dumps(default=str) on Decimal); dates and timestamps
+    already render as ISO 8601.
+    """
+    table = model.__table__
+    row = select(*(
+        cast(column, Text).label(column.name) if isinstance(column.type, Numeric) else column
+        for column in table.columns
+    )).subquery(table.name)
+    return select(cast(func.row_to_json(row.table_valued()), Text))
 
 
 @router.get("/bootstrap")
@@ -164,32 +308,7 @@ async def bootstrap_user(db: AsyncSession = Depends(get_async_db)):
 async def get_data_summary(db: AsyncSession = Depends(get_async_db)):
     """Get counts of all user data tables"""
     
-    counts = {}
-    
-    # Count each table
-    result = await db.execute(select(UserProfile))
-    counts["user_profile"] = len(result.scalars().all())
-    
-    result = await db.execute(select(Account))
-    counts["accounts"] = len(result.scalars().all())
-    
-    result = await db.execute(select(Category))
-    counts["categories"] = len(result.scalars().all())
-    
-    result = await db.execute(select(Transaction))
-    counts["transactions"] = len(result.scalars().all())
-    
-    result = await db.execute(select(Portfolio))
-    counts["portfolios"] = len(result.scalars().all())
-    
-    result = await db.execute(select(PortfolioTransaction))
-    counts["portfolio_transactions"] = len(result.scalars().all())
-    
-    result = await db.execute(select(MarketPrice))
-    counts["market_prices"] = len(result.scalars().all())
-    
-    result = await db.execute(select(InvestorProfile))
-    counts["investor_profiles"] = len(result.scalars().all())
+    counts = await count_user_data(db)
     
     # Calculate total
     counts["total"] = sum(counts.values())
@@ -197,57 +316,54 @@ async def get_data_summary(db: AsyncSession = Depends(get_async_db)):
     return {"success": True, "counts": counts}
 
 
-@router.get("/export")
-async def export_all_data(db: AsyncSession = Depends(get_async_db)):
-    """Export all user data to JSON file"""
-    
-    # Query all tables
-    user_profiles = await db.execute(select(UserProfile))
-    accounts = await db.execute(select(Account))
-    categories = await db.execute(select(Category))
-    transactions = await db.execute(select(Transaction))
-    portfolios = await db.execute(select(Portfolio))
-    portfolio_transactions = await db.execute(select(PortfolioTransaction))
-    market_prices = await db.execute(select(MarketPrice))
-    investor_profiles = await db.execute(select(InvestorProfile))
-    
-    # Convert to lists of dicts
-    data = {
-        "user_profile": [model_to_dict(r) for r in user_profiles.scalars().all()],
-        "accounts": [model_to_dict(r) for r in accounts.scalars().all()],
-        "categories": [model_to_dict(r) for r in categories.scalars().all()],
-        "transactions": [model_to_dict(r) for r in transactions.scalars().all()],
-        "portfolios": [model_to_dict(r) for r in portfolios.scalars().all()],
-        "portfolio_transactions": [model_to_dict(r) for r in portfolio_transactions.scalars().all()],
-        "market_prices": [model_to_dict(r) for r in market_prices.scalars().all()],
-        "investor_profiles": [model_to_dict(r) for r in investor_profiles.scalars().all()],
+# Rows fetched per server-side cursor round trip during export
+EXPORT_YIELD_PER = 1000
+
+
+async def stream_export_json(exported_at: str):
+    """
+    Yield the export file piece by piece: envelope, then each table as a
+    JSON array read through a server-side cursor, then the counts.
+    Opens its own session - the request's session is closed before a
+    streaming body is sent.
+    """
+    export_info = {
+        "exported_at": exported_at,
+        "version": "1.0",
+        "source": "Capricorn"
     }
-    
-    # Build counts
-    counts = {key: len(value) for key, value in data.items()}
+    yield b'{"export_info": ' + orjson.dumps(export_info) + b', "data": {'
+
+    counts = {}
+    async with AsyncSessionLocal() as session:
+        for index, (name, model) in enumerate(USER_DATA_TABLES):
+            yield (b', ' if index else b'') + orjson.dumps(name) + b': ['
+            count = 0
+            # Postgres renders each row as JSON: no per-column decoding in Python
+            result = await session.stream(
+                export_rows_query(model).execution_options(yield_per=EXPORT_YIELD_PER)
+            )
+            async for partition in result.scalars().partitions():
+                yield (b', ' if count else b'') + ', '.join(partition).encode()
+                count += len(partition)
+            yield b']'
+            counts[name] = count
+
     counts["total"] = sum(counts.values())
-    
-    # Build export object
-    export_data = {
-        "export_info": {
-            "exported_at": datetime.utcnow().isoformat() + "Z",
-            "version": "1.0",
-            "source": "Capricorn"
-        },
-        "data": data,
-        "counts": counts
-    }
+    yield b'}, "counts": ' + orjson.dumps(counts) + b'}'
+
+
+@router.get("/export")
+async def export_all_data():
+    """Export all user data to JSON file (streamed, one table at a time)"""
+    exported_at = datetime.utcnow().isoformat() + "Z"
     
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
     filename = f"Capricorn_UserData_{timestamp}.json"
     
-    # Convert to JSON
-    json_content = json.dumps(export_data, indent=2, default=str)
-    
-    # Return as downloadable file
     return StreamingResponse(
-        io.BytesIO(json_content.encode('utf-8')),
+        stream_export_json(exported_at),
         media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -284,113 +400,20 @@ async def import_all_data(
         await db.execute(delete(InvestorProfile))
         await db.execute(delete(UserProfile))
         
-        await db.commit()
-        
+        # Deletes and inserts share one transaction: a failed import rolls
+        # back to the previous data instead of leaving the tables empty
         imported_counts = {}
         
-        # Import user_profile
-        for item in data.get("user_profile", []):
-            # Remove any None values that could cause issues
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            # Handle datetime fields
-            for date_field in ['created_at', 'updated_at']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(UserProfile(**clean_item))
-        imported_counts["user_profile"] = len(data.get("user_profile", []))
-        
-        # Import investor_profiles
-        for item in data.get("investor_profiles", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(InvestorProfile(**clean_item))
-        imported_counts["investor_profiles"] = len(data.get("investor_profiles", []))
-        
-        # Import accounts
-        for item in data.get("accounts", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(Account(**clean_item))
-        imported_counts["accounts"] = len(data.get("accounts", []))
-        
-        # Import categories
-        for item in data.get("categories", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(Category(**clean_item))
-        imported_counts["categories"] = len(data.get("categories", []))
-        
-        # Import portfolios
-        for item in data.get("portfolios", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(Portfolio(**clean_item))
-        imported_counts["portfolios"] = len(data.get("portfolios", []))
-        
-        # Import market_prices
-        for item in data.get("market_prices", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at', 'last_updated']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-            db.add(MarketPrice(**clean_item))
-        imported_counts["market_prices"] = len(data.get("market_prices", []))
-        
-        # Commit base tables first
-        await db.commit()
-        
-        # Import transactions (depends on accounts, categories)
-        for item in data.get("transactions", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at', 'transaction_date']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    if 'T' in clean_item[date_field]:
-                        clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-                    else:
-                        # Just a date, not datetime
-                        from datetime import date
-                        clean_item[date_field] = datetime.strptime(clean_item[date_field], '%Y-%m-%d').date()
-            db.add(Transaction(**clean_item))
-        imported_counts["transactions"] = len(data.get("transactions", []))
-        
-        # Import portfolio_transactions (depends on portfolios)
-        for item in data.get("portfolio_transactions", []):
-            clean_item = {k: v for k, v in item.items() if v is not None or k == 'id'}
-            for date_field in ['created_at', 'updated_at', 'transaction_date']:
-                if date_field in clean_item and isinstance(clean_item[date_field], str):
-                    if 'T' in clean_item[date_field]:
-                        clean_item[date_field] = datetime.fromisoformat(clean_item[date_field].replace('Z', '+00:00'))
-                    else:
-                        from datetime import date
-                        clean_item[date_field] = datetime.strptime(clean_item[date_field], '%Y-%m-%d').date()
-            db.add(PortfolioTransaction(**clean_item))
-        imported_counts["portfolio_transactions"] = len(data.get("portfolio_transactions", []))
-        
-        await db.commit()
-        
-        # Reset sequences for all tables
-        tables_with_sequences = [
-            'user_profile', 'accounts', 'categories', 'transactions',
-            'portfolios', 'portfolio_transactions', 'market_prices', 'investor_profiles'
-        ]
+        # Import base tables (FK parents of the dependent tables below)
+        for name, model, date_fields in IMPORT_BASE_TABLES:
+            imported_counts[name] = await bulk_import_rows(db, model, data.get(name, []), date_fields)
         
-        for table in tables_with_sequences:
-            try:
-                await db.execute(text(
-                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
-                    f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
-                ))
-            except Exception:
-                pass  # Some tables might not have sequences
+        # Dependent tables (transactions -> accounts/categories, portfolio_transactions -> portfolios)
+        for name, model, date_fields in IMPORT_DEPENDENT_TABLES:
+            imported_counts[name] = await bulk_import_rows(db, model, data.get(name, []), date_fields)
         
+        # Move each id sequence past the imported ids
+        await db.execute(SYNC_USER_DATA_SEQUENCES)
         await db.commit()
         
         imported_counts["total"] = sum(imported_counts.values())
@@ -411,57 +434,11 @@ async def clear_all_data(db: AsyncSession = Depends(get_async_db)):
     """Clear all user data from the database"""
     
     try:
-        deleted_counts = {}
-        
         # Get counts before deletion
-        result = await db.execute(select(PortfolioTransaction))
-        deleted_counts["portfolio_transactions"] = len(result.scalars().all())
-        
-        result = await db.execute(select(Transaction))
-        deleted_counts["transactions"] = len(result.scalars().all())
-        
-        result = await db.execute(select(MarketPrice))
-        deleted_counts["market_prices"] = len(result.scalars().all())
-        
-        result = await db.execute(select(Portfolio))
-        deleted_counts["portfolios"] = len(result.scalars().all())
-        
-        result = await db.execute(select(Category))
-        deleted_counts["categories"] = len(result.scalars().all())
-        
-        result = await db.execute(select(Account))
-        deleted_counts["accounts"] = len(result.scalars().all())
-        
-        result = await db.execute(select(InvestorProfile))
-        deleted_counts["investor_profiles"] = len(result.scalars().all())
-        
-        result = await db.execute(select(UserProfile))
-        deleted_counts["user_profile"] = len(result.scalars().all())
-        
-        # Clear all user data tables (reverse dependency order)
-        await db.execute(delete(PortfolioTransaction))
-        await db.execute(delete(Transaction))
-        await db.execute(delete(MarketPrice))
-        await db.execute(delete(Portfolio))
-        await db.execute(delete(Category))
-        await db.execute(delete(Account))
-        await db.execute(delete(InvestorProfile))
-        await db.execute(delete(UserProfile))
-        
-        await db.commit()
-        
-        # Reset sequences
-        tables_with_sequences = [
-            'user_profile', 'accounts', 'categories', 'transactions',
-            'portfolios', 'portfolio_transactions', 'market_prices', 'investor_profiles'
-        ]
-        
-        for table in tables_with_sequences:
-            try:
-                await db.execute(text(f"ALTER SEQUENCE {table}_id_seq RESTART WITH 1"))
-            except Exception:
-                pass  # Some tables might not have sequences
+        deleted_counts = await count_user_data(db)
         
+        # Clear all user data tables and reset their id sequences
+        await db.execute(TRUNCATE_USER_DATA)
         await db.commit()
         
         deleted_counts["total"] = sum(deleted_counts.values())
@@ -4,25 +4,39 @@ DEV MODE: No authentication, returns default user
 """
 
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from app.models.user_profile import UserProfile
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.core.constants import SINGLE_USER_ID
 
 class DummyUser:
     """Dummy user for DEV mode without authentication"""
-    id = "1"  # Default to user_id=1 which we imported
+    id = SINGLE_USER_ID  # int, so it binds cleanly to Integer columns under asyncpg
     email = "demo@example.com"
     first_name = "Demo"
     last_name = "User"
     is_active = True
     
-def get_current_user(db: Session = Depends(get_db)) -> DummyUser:
+def get_current_user(request: Request) -> DummyUser:
     """
     DEV MODE: Returns dummy user without authentication
     In production, this would validate JWT tokens
+    
+    The resolved user is kept on request.state so any later lookup in the
+    same request (middleware, nested dependencies) skips resolution.
+    """
+    user = getattr(request.state, "user", None)
+    if user is None:
+        user = DummyUser()
+        request.state.user = user
+    return user
+
+def get_current_user_id(current_user: DummyUser = Depends(get_current_user)) -> int:
+    """
+    ID of the current user, for handlers that only scope queries by user.
+    DEV MODE: always SINGLE_USER_ID; follows get_current_user once real
+    authentication replaces the dummy user.
     """
-    return DummyUser()
+    return current_user.id
 
 def get_current_active_user(current_user: DummyUser = Depends(get_current_user)) -> DummyUser:
     """
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     # Build
     BUILD_NUMBER: str = "1"
     
+    # File processing: optional pause before each step of /process-steps so
+    # a demo UI can show the stages; 0 runs the steps back to back
+    PROCESSING_STEP_DELAY: float = 0.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
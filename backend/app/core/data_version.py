@@ -0,0 +1,110 @@
+"""
+Finance data version
+Response cache keys for the finance, category and settings endpoints embed a
+version that moves after every committed write to transactions, categories or
+accounts, so writes never have to purge those caches.
+
+The database only announces writes: a statement-level trigger sends
+NOTIFY finance_data_changed with the writing transaction's id (delivered on
+commit, no row lock held). Each worker LISTENs and bumps a shared counter in
+Redis, deduplicated per transaction id so the four workers receiving the same
+notification bump it once and all land on the same value. Key builders read
+the worker's in-memory copy: no DB or Redis round trip per request.
+"""
+import asyncio
+import logging
+import uuid
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FINANCE_DATA_CHANNEL = "finance_data_changed"
+FINANCE_DATA_VERSION_KEY = "capricorn:finance_data_version"
+
+# How long a processed change id is remembered for deduplication (seconds)
+CHANGE_ID_TTL = 3600
+
+# Delay before reconnecting a dropped LISTEN connection (seconds)
+LISTEN_RETRY_DELAY = 5
+
+# Bump the counter once per change id; every later caller for the same id
+# gets the already-bumped value. Runs atomically, so no caller can read the
+# counter between another caller's SET and INCR.
+_BUMP_SCRIPT = """
+if redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[1]) then
+    return redis.call('INCR', KEYS[1])
+end
+return tonumber(redis.call('GET', KEYS[1]) or '0')
+"""
+
+_version = 0
+
+
+def current_finance_data_version() -> int:
+    """This worker's copy of the finance data version (no I/O)"""
+    return _version
+
+
+async def apply_finance_data_change(redis, change_id: str) -> int:
+    """
+    Move this worker to the version for change_id, bumping the shared counter
+    if no other worker has done so yet. Falls back to a local bump if Redis is
+    unreachable (the Redis cache is unusable then anyway, and the in-process
+    caches still must not serve pre-write entries).
+    """
+    global _version
+    try:
+        version = int(await redis.eval(
+            _BUMP_SCRIPT, 2, FINANCE_DATA_VERSION_KEY,
+            f"{FINANCE_DATA_VERSION_KEY}:seen:{change_id}", CHANGE_ID_TTL
+        ))
+    except Exception as e:
+        logger.warning(f"Finance data version bump via Redis failed: {e}")
+        version = _version + 1
+    _version = max(_version, version)
+    return _version
+
+
+async def listen_for_finance_data_changes(redis) -> None:
+    """
+    Keep a LISTEN connection open for the life of the worker. Notifications
+    sent while it was down are lost, so every (re)connect also bumps the
+    version once.
+    """
+    async def on_change(connection, pid, channel, payload):
+        await apply_finance_data_change(redis, payload)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(settings.DATABASE_URL)
+            closed = asyncio.get_running_loop().create_future()
+            connection.add_termination_listener(
+                lambda _: closed.done() or closed.set_result(None)
+            )
+            await connection.add_listener(FINANCE_DATA_CHANNEL, on_change)
+            await apply_finance_data_change(redis, f"listen:{uuid.uuid4()}")
+            await closed
+            logger.warning("Finance data LISTEN connection closed; reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Finance data LISTEN failed: {e}")
+        finally:
+            # Listen-only connection: drop it without an awaited goodbye, which
+            # a cancellation could interrupt
+            if connection is not None and not connection.is_closed():
+                connection.terminate()
+        await asyncio.sleep(LISTEN_RETRY_DELAY)
+
+
+async def start_finance_data_version(redis) -> asyncio.Task:
+    """
+    Startup: take a fresh shared version (this worker may have missed writes
+    while it was not running), then start the LISTEN task.
+    """
+    await apply_finance_data_change(redis, f"start:{uuid.uuid4()}")
+    return asyncio.create_task(listen_for_finance_data_changes(redis))
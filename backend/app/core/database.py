@@ -28,11 +28,14 @@ def get_db():
         db.close()
 
 # Async database support for Finance Manager endpoints
+# Same 30-connection ceiling as the sync engine, but most of it is kept warm:
+# overflow connections are closed on checkin, so concurrent uploads and
+# dashboard fan-outs would otherwise pay a fresh asyncpg connect each time
 async_engine = create_async_engine(
     settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://'),
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=20,
+    max_overflow=10
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -46,3 +49,13 @@ async def get_async_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+
+async def execute_in_new_session(statement):
+    """
+    Execute a statement in its own short-lived AsyncSession.
+    A single AsyncSession cannot run queries concurrently, so independent
+    queries fanned out with asyncio.gather each need their own session.
+    The returned Result is already buffered and usable after the session closes.
+    """
+    async with AsyncSessionLocal() as session:
+        return await session.execute(statement)
@@ -0,0 +1,45 @@
+"""
+Request-scoped DataLoaders
+Coalesce repeated by-id lookups made while handling one request into a
+single WHERE id IN (...) query.
+"""
+from aiodataloader import DataLoader
+from fastapi import Depends
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_user
+from app.core.database import get_async_db
+from app.models.account import Account
+
+# Statement shape never changes, so build and cache its compiled form once
+_ACCOUNTS_BY_IDS = lambda_stmt(
+    lambda: select(Account).where(
+        Account.id.in_(bindparam("ids", expanding=True)),
+        Account.user_id == bindparam("uid")
+    )
+)
+
+class AccountLoader(DataLoader):
+    """Batched Account lookups, restricted to the current user's accounts"""
+
+    def __init__(self, db: AsyncSession, user_id):
+        super().__init__()
+        self.db = db
+        self.user_id = user_id
+
+    async def batch_load_fn(self, account_ids):
+        accounts = (await self.db.scalars(
+            _ACCOUNTS_BY_IDS, {"ids": list(account_ids), "uid": self.user_id}
+        )).all()
+        accounts_by_id = {account.id: account for account in accounts}
+        # DataLoader contract: one result per key, in key order (None if missing)
+        return [accounts_by_id.get(account_id) for account_id in account_ids]
+
+
+def get_account_loader(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+) -> AccountLoader:
+    """Dependency: new AccountLoader per request (shares the request's session)"""
+    return AccountLoader(db, current_user.id)
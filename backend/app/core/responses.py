@@ -0,0 +1,22 @@
+"""
+Shared response classes for API routers
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse as _FastAPIORJSONResponse
+
+
+class ORJSONResponse(_FastAPIORJSONResponse):
+    """
+    JSON response rendered with orjson.
+    Naive datetimes from the database are treated as UTC and numpy
+    values are serialized directly, so handlers can return them as-is.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
@@ -5,8 +5,13 @@ FastAPI backend for unified personal finance management
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_async_db, AsyncSessionLocal
+from app.core.data_version import start_finance_data_version
 import os
 import logging
 
@@ -25,6 +30,13 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Capricorn API starting up...")
     
+    # Response cache (connection is lazy, so a missing Redis only logs cache misses)
+    redis = aioredis.from_url(settings.REDIS_URL)
+    FastAPICache.init(RedisBackend(redis), prefix="capricorn")
+    
+    # Finance data version embedded in cache keys, kept current by LISTEN
+    data_version_listener = await start_finance_data_version(redis)
+    
     # Bootstrap user if database is empty
     try:
         from app.api.v1.data.endpoints import ensure_bootstrap_user
@@ -41,6 +53,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Capricorn API shutting down...")
+    data_version_listener.cancel()
 
 app = FastAPI(
     title="Capricorn Finance API",
@@ -7,6 +7,7 @@ from .category import Category
 from .account import Account
 from .transaction import Transaction
 from .budget import Budget
+from .transaction_daily_summary import TransactionDailySummary
 
 __all__ = [
     "Base",
@@ -15,4 +16,5 @@ __all__ = [
     "Account",
     "Transaction",
     "Budget",
+    "TransactionDailySummary",
 ]
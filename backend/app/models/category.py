@@ -4,7 +4,7 @@ Hierarchical category structure with parent-child relationships
 Migrated from Finance Manager categories table
 """
 from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, backref
 from .base import Base, TimestampMixin
 
 class Category(Base, TimestampMixin):
@@ -18,7 +18,14 @@ class Category(Base, TimestampMixin):
     is_active = Column(Boolean, default=True, nullable=False, index=True)
     
     # Self-referential relationship for hierarchy
-    parent = relationship("Category", remote_side=[id], backref="children")
+    # raise_on_sql: an un-loaded parent/children access raises instead of
+    # emitting one SELECT per row; eager-load with selectinload/joinedload
+    parent = relationship(
+        "Category",
+        remote_side=[id],
+        backref=backref("children", lazy="raise_on_sql"),
+        lazy="raise_on_sql"
+    )
     
     def __repr__(self):
         parent_info = f", parent_id={self.parent_id}" if self.parent_id else ""
@@ -26,7 +33,7 @@ class Category(Base, TimestampMixin):
     
     @property
     def full_path(self):
-        """Get full category path (e.g., 'Parent > Child')"""
+        """Get full category path (e.g., 'Parent > Child'); needs parent eager-loaded"""
         if self.parent:
             return f"{self.parent.full_path} > {self.name}"
         return self.name
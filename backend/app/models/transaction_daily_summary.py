@@ -0,0 +1,22 @@
+"""
+Transaction Daily Summary Model
+Per-(user, day, category) rollup of transactions, maintained by database
+triggers (database/init/012_transaction_daily_summary.sql); read-only here
+"""
+from sqlalchemy import Column, Integer, Date, Numeric
+from .base import Base
+
+class TransactionDailySummary(Base):
+    __tablename__ = "transaction_daily_summary"
+    
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=0)  # 0 = uncategorized
+    
+    credit_sum = Column(Numeric(14, 2), nullable=False, default=0)
+    debit_sum = Column(Numeric(14, 2), nullable=False, default=0)  # Signed, as stored on transactions
+    debit_abs_sum = Column(Numeric(14, 2), nullable=False, default=0)
+    tx_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<TransactionDailySummary(user_id={self.user_id}, day={self.day}, category_id={self.category_id}, tx_count={self.tx_count})>"
@@ -3,15 +3,15 @@ Pydantic schemas for API validation
 """
 
 from .user import UserCreate, UserUpdate, UserResponse
-from .account import AccountCreate, AccountUpdate, AccountResponse, AccountSummary
-from .category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryTree
+from .account import AccountCreate, AccountUpdate, AccountResponse, AccountSummary, AccountPage
+from .category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryPage, CategoryTree
 from .transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionSummary
 from .budget import BudgetCreate, BudgetUpdate, BudgetResponse
 
 __all__ = [
     'UserCreate', 'UserUpdate', 'UserResponse',
-    'AccountCreate', 'AccountUpdate', 'AccountResponse', 'AccountSummary',
-    'CategoryCreate', 'CategoryUpdate', 'CategoryResponse', 'CategoryTree',
+    'AccountCreate', 'AccountUpdate', 'AccountResponse', 'AccountSummary', 'AccountPage',
+    'CategoryCreate', 'CategoryUpdate', 'CategoryResponse', 'CategoryPage', 'CategoryTree',
     'TransactionCreate', 'TransactionUpdate', 'TransactionResponse', 'TransactionSummary',
     'BudgetCreate', 'BudgetUpdate', 'BudgetResponse',
 ]
\ No newline at end of file
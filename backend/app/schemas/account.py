@@ -3,8 +3,9 @@ Account schemas for API requests/responses
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from decimal import Decimal
+from datetime import datetime
 
 class AccountBase(BaseModel):
     name: str
@@ -22,13 +23,23 @@ class AccountUpdate(BaseModel):
 
 class AccountResponse(AccountBase):
     id: int
+    user_id: int
     balance: Decimal
+    credit_limit: Optional[Decimal] = None
     is_active: bool
+    created_at: datetime
+    updated_at: datetime
     
     class Config:
         from_attributes = True
 
 class AccountSummary(BaseModel):
-    total_accounts: int
-    total_balance: Decimal
-    active_accounts: int
+    id: int
+    name: str
+    account_type: str
+    balance: Decimal
+    is_active: bool
+
+class AccountPage(BaseModel):
+    items: List[AccountSummary]
+    next_cursor: Optional[int] = None
@@ -4,6 +4,7 @@ Category schemas for API requests/responses
 
 from pydantic import BaseModel
 from typing import Optional, List
+from datetime import datetime
 
 class CategoryBase(BaseModel):
     name: str
@@ -18,13 +19,23 @@ class CategoryUpdate(BaseModel):
     type: Optional[str] = None
     parent_category_id: Optional[int] = None
 
-class CategoryResponse(CategoryBase):
+class CategoryResponse(BaseModel):
     id: int
-    user_id: int
+    name: str
+    description: Optional[str] = None
+    category_type: str
+    parent_id: Optional[int] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
     
     class Config:
         from_attributes = True
 
+class CategoryPage(BaseModel):
+    items: List[CategoryResponse]
+    next_cursor: Optional[str] = None
+
 class CategoryTree(CategoryResponse):
     children: List['CategoryTree'] = []
     
@@ -6,6 +6,7 @@ from the working directory and creates a Master_Transactions.csv file.
 """
 
 import csv
+import io
 import os
 import glob
 import shutil
@@ -41,15 +42,18 @@ def read_file_with_encoding(file_path):
     """Read file with multiple encoding attempts"""
     encodings = ['utf-8', 'iso-8859-1', 'cp1252', 'latin-1']
     
+    # One sequential read from disk; each encoding attempt decodes in memory
+    try:
+        raw = Path(file_path).read_bytes()
+    except Exception as e:
+        raise Exception(f"Unable to read {file_path}: {e}")
+    
     for encoding in encodings:
         try:
-            with open(file_path, 'r', newline='', encoding=encoding) as f:
-                return f.readlines(), encoding
+            # newline='' keeps line endings as-is, like open(..., newline='')
+            return io.StringIO(raw.decode(encoding), newline='').readlines(), encoding
         except (UnicodeDecodeError, UnicodeError):
             continue
-        except Exception as e:
-            print(f"  ⚠️  Error reading {file_path} with {encoding}: {e}")
-            continue
     
     raise Exception(f"Unable to read {file_path} with any supported encoding")
 
@@ -107,35 +111,30 @@ def parse_bofa_checking_file(file_path, filename):
         lines, encoding = read_file_with_encoding(file_path)
         print(f"  📝 Reading with {encoding} encoding")
         
-        # Headers on row 7 (index 6), data starts on row 8 (index 7)
-        if len(lines) > 7:
-            for line_idx in range(7, len(lines)):
-                line = lines[line_idx].strip()
-                if line:
-                    try:
-                        # Parse CSV line
-                        reader = csv.reader([line])
-                        row = next(reader)
-                        
-                        # Handle BOM in first field if present
-                        if row and row[0].startswith('\ufeff'):
-                            row[0] = row[0].lstrip('\ufeff')
+        # Headers on row 7 (index 6), data starts on row 8 (index 7).
+        # One reader over all data lines (blank lines come back as empty rows)
+        for row_idx, row in enumerate(csv.reader(lines[7:]), start=8):
+            if row:
+                try:
+                    # Handle BOM in first field if present
+                    if row[0].startswith('\ufeff'):
+                        row[0] = row[0].lstrip('\ufeff')
+                    
+                    if len(row) >= 3:
+                        date = row[0].strip()
+                        description = row[1].strip()
+                        amount = row[2].strip()
                         
-                        if len(row) >= 3:
-                            date = row[0].strip()
-                            description = row[1].strip()
-                            amount = row[2].strip()
+                        # Skip empty dates or header-like rows
+                        if date and date != "Date" and description:
+                            if not is_valid_amount(amount):
+                                skipped_count += 1
+                                continue
                             
-                            # Skip empty dates or header-like rows
-                            if date and date != "Date" and description:
-                                if not is_valid_amount(amount):
-                                    skipped_count += 1
-                                    continue
-                                
-                                transaction_type = determine_transaction_type(amount)
-                                transactions.append([date, description, amount, spender, "BOFA Checking", transaction_type, "", ""])
-                    except Exception as e:
-                        print(f"  ⚠️  Error parsing line {line_idx + 1}: {e}")
+                            transaction_type = determine_transaction_type(amount)
+                            transactions.append([date, description, amount, spender, "BOFA Checking", transaction_type, "", ""])
+                except Exception as e:
+                    print(f"  ⚠️  Error parsing row {row_idx}: {e}")
         
         print(f"  ✅ Parsed {len(transactions)} transactions")
         if skipped_count > 0:
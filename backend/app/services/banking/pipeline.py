@@ -17,14 +17,15 @@ import shutil
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, date
 from decimal import Decimal
 import pandas as pd
+import xxhash
 from app.core.constants import SINGLE_USER_ID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, insert, and_, func
 from sqlalchemy.orm import selectinload
 
 from app.models.transaction import Transaction
@@ -40,6 +41,15 @@ from .tagger import IntelligentTagger
 # Note: duplicate_checker.py has functions, not a class - we implement our own duplicate checking
 
 
+def transaction_key(transaction_date: date, amount: Decimal, description: str) -> int:
+    """
+    Duplicate-detection key: 64-bit xxh3 of date|amount|description.
+    Deterministic across processes (unlike hash()), and a set of ints is far
+    smaller than a set of tuples holding every description.
+    """
+    return xxhash.xxh3_64_intdigest(f"{transaction_date}|{amount:.2f}|{description}".encode())
+
+
 class TransactionPipeline:
     """Main pipeline for processing uploaded financial CSV files"""
     
@@ -77,26 +87,17 @@ class TransactionPipeline:
             Processing results including statistics
         """
         try:
-            # Copy file to input directory
-            input_file = self.input_dir / Path(file_path).name
-            shutil.copy2(file_path, input_file)
-            
-            # Step 1: Classify the file type using analyze_csv_structure
-            file_type = analyze_csv_structure(str(input_file))
+            # Steps 1-2 are blocking file I/O and CSV parsing; run them in a
+            # worker thread so the event loop keeps serving other requests
+            file_type, transactions_list = await asyncio.to_thread(
+                self._classify_and_parse, file_path
+            )
             if not file_type:
                 return {
                     "status": "error",
                     "message": "Unable to determine file type. Supported: BOFA_CHECKING, BOFA_CREDIT, AMEX_CREDIT"
                 }
             
-            # Move to working directory (where parser expects classified files)
-            working_dir = self.base_dir / "working"
-            working_dir.mkdir(parents=True, exist_ok=True)
-            classified_file = working_dir / f"{file_type}_{input_file.name}"
-            shutil.move(str(input_file), str(classified_file))
-            
-            # Step 2: Parse transactions from CSV
-            transactions_list = parse_classified_files(str(self.base_dir))
             if not transactions_list:
                 return {
                     "status": "error", 
@@ -107,25 +108,25 @@ class TransactionPipeline:
             columns = ['transaction_date', 'description', 'amount', 'spender', 'source', 'transaction_type', 'tag', 'duplicate']
             transactions_df = pd.DataFrame(transactions_list, columns=columns)
             
-            # Step 3: Auto-tag transactions
+            # Step 3: Auto-tag transactions - amounts are converted column-wise
+            # and the whole file is tagged in one batch call
+            descriptions = transactions_df['description'].astype(str).tolist()
+            amounts = pd.to_numeric(
+                transactions_df['amount'].astype(str).str.replace(',', '', regex=False),
+                errors='coerce'
+            ).fillna(0).tolist()
+            category_names = self.tagger.tag_transactions(descriptions, amounts)
+
             tagged_transactions = []
-            for _, row in transactions_df.iterrows():
-                description = str(row['description'])
-                # Convert amount to float
-                try:
-                    amount = float(str(row['amount']).replace(',', ''))
-                except (ValueError, TypeError):
-                    amount = 0
-                
-                # Get ML prediction using tag_transaction method
-                category_name = self.tagger.tag_transaction(description, amount)
+            for description, amount, category_name, date_str, source, spender in zip(
+                descriptions, amounts, category_names,
+                transactions_df['transaction_date'], transactions_df['source'], transactions_df['spender']
+            ):
                 # Default to "Uncategorized" if no tag found
                 if not category_name or category_name.strip() == '':
                     category_name = 'Uncategorized'
                 
                 # Parse date properly (Finance Manager approach - 3 formats)
-                from datetime import datetime
-                date_str = row['transaction_date']
                 try:
                     # Try format 1: YYYY-MM-DD
                     transaction_date = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -142,29 +143,30 @@ class TransactionPipeline:
                             print(f"❌ Failed to parse date '{date_str}' with all 3 formats, using today's date")
                             transaction_date = datetime.now().date()
                 
+                # Account key from source + spender (Finance Manager approach)
+                account_key = f"{source}_{spender}" if spender and spender != "Unknown" else source
+                
                 tagged_transactions.append({
                     'transaction_date': transaction_date,
                     'description': description,
                     'amount': abs(amount),  # Store as positive
                     'transaction_type': 'credit' if amount > 0 else 'debit',
                     'category_name': category_name,
-                    'file_type': file_type
+                    'file_type': file_type,
+                    'source': source,
+                    'spender': spender,
+                    'account_key': account_key
                 })
             
             # Step 4: Extract unique accounts from transactions (source + spender)
             print(f"🏦 Identifying accounts from transactions...")
             unique_accounts = {}
             for trans in tagged_transactions:
-                # Get source and spender from original transactions_df
-                source = transactions_df[transactions_df['description'] == trans['description']]['source'].iloc[0]
-                spender = transactions_df[transactions_df['description'] == trans['description']]['spender'].iloc[0]
-                
-                # Create account name from source and spender (Finance Manager approach)
-                account_key = f"{source}_{spender}" if spender and spender != "Unknown" else source
+                account_key = trans['account_key']
                 if account_key not in unique_accounts:
                     unique_accounts[account_key] = {
-                        'source': source,
-                        'spender': spender,
+                        'source': trans['source'],
+                        'spender': trans['spender'],
                         'file_type': trans['file_type']
                     }
             
@@ -179,9 +181,9 @@ class TransactionPipeline:
                 account_cache[account_key] = account
                 print(f"   ✅ Account: {account.name} (ID: {account.id})")
             
-            # Commit accounts first
-            await db.commit()
-            print(f"✅ All accounts created and committed")
+            # Accounts are only flushed (IDs assigned); the whole upload is
+            # committed once, together with its transactions
+            print(f"✅ All accounts ready")
             
             # Step 5: PRE-CREATE ALL CATEGORIES (Finance Manager approach)
             print(f"📋 Pre-creating categories...")
@@ -199,12 +201,17 @@ class TransactionPipeline:
                 category_cache[category_name] = category
                 print(f"   ✅ Category cached: {category_name} (ID: {category.id})")
             
-            # Commit categories first
-            await db.commit()
-            print(f"✅ All categories created and committed")
+            print(f"✅ All categories ready")
             
-            # Step 6: Check for duplicates and save to database
-            saved_count = 0
+            # Step 6: Check for duplicates, then save all new rows in one
+            # bulk INSERT (executemany) instead of one ORM object per row.
+            # Keys of existing transactions in the file's date window are
+            # loaded once, so each check is a set lookup rather
+            # than a query per transaction
+            file_dates = [trans['transaction_date'] for trans in tagged_transactions]
+            existing_keys = await self._load_transaction_keys(db, min(file_dates), max(file_dates))
+            
+            new_rows = []
             duplicate_count = 0
             
             print(f"📝 Processing {len(tagged_transactions)} transactions...")
@@ -212,21 +219,14 @@ class TransactionPipeline:
                 if idx == 0:
                     print(f"  First transaction: {trans['description'][:30]} - ${trans['amount']}")
                 
-                # Check for duplicate
-                try:
-                    is_duplicate = await self._check_duplicate(
-                        db,
-                        trans['transaction_date'],
-                        trans['amount'],
-                        trans['description']
-                    )
-                except Exception as e:
-                    print(f"❌ Duplicate check error: {e}")
-                    is_duplicate = False
-                
-                if is_duplicate:
+                # Check for duplicate; keys queued in this batch are added to
+                # the set too, so repeats within the file are caught as well
+                amount = Decimal(str(abs(trans['amount'])))
+                key = transaction_key(trans['transaction_date'], amount, trans['description'])
+                if key in existing_keys:
                     duplicate_count += 1
                     continue
+                existing_keys.add(key)
                 
                 # Get category from cache (Finance Manager approach - no DB queries!)
                 category = None
@@ -236,37 +236,34 @@ class TransactionPipeline:
                         print(f"  Category: {category.name} (ID: {category.id}) [from cache]")
                 
                 # Get account from cache based on source + spender
-                source = transactions_df[transactions_df['description'] == trans['description']]['source'].iloc[0]
-                spender = transactions_df[transactions_df['description'] == trans['description']]['spender'].iloc[0]
-                account_key = f"{source}_{spender}" if spender and spender != "Unknown" else source
-                account = account_cache.get(account_key)
+                account = account_cache.get(trans['account_key'])
                 
                 if not account:
-                    print(f"⚠️  Account not found for key: {account_key}, using first account")
+                    print(f"⚠️  Account not found for key: {trans['account_key']}, using first account")
                     account = list(account_cache.values())[0]
                 
                 if idx == 0:
                     print(f"  Account: {account.name} (ID: {account.id}) [from cache]")
                 
-                # Create transaction
-                new_transaction = Transaction(
-                    user_id=SINGLE_USER_ID,
-                    account_id=account.id,
-                    category_id=category.id if category else None,
-                    description=trans['description'],
-                    amount=Decimal(str(abs(trans['amount']))),
-                    transaction_date=trans['transaction_date'],
-                    transaction_type=trans['transaction_type'],
-                    is_processed=True  # Mark as auto-tagged
-                )
-                
-                db.add(new_transaction)
-                saved_count += 1
+                new_rows.append({
+                    'user_id': SINGLE_USER_ID,
+                    'account_id': account.id,
+                    'category_id': category.id if category else None,
+                    'description': trans['description'],
+                    'amount': amount,
+                    'transaction_date': trans['transaction_date'],
+                    'transaction_type': trans['transaction_type'],
+                    'is_processed': True  # Mark as auto-tagged
+                })
             
+            saved_count = len(new_rows)
             print(f"💾 Ready to save {saved_count} transactions, {duplicate_count} duplicates found")
             
-            # Commit all transactions
+            # Insert all transactions and commit the upload's single
+            # transaction (accounts, categories and rows together)
             try:
+                if new_rows:
+                    await db.execute(insert(Transaction), new_rows)
                 await db.commit()
                 print(f"✅ Committed {saved_count} transactions to database")
             except Exception as e:
@@ -301,11 +298,40 @@ class TransactionPipeline:
             }
             
         except Exception as e:
+            # Nothing from a failed upload is kept
+            await db.rollback()
             return {
                 "status": "error",
                 "message": str(e)
             }
     
+    def _classify_and_parse(self, file_path: str) -> Tuple[Optional[str], List[list]]:
+        """
+        Stage an uploaded file, classify it and parse the working directory.
+        Blocking; called via asyncio.to_thread.
+        
+        Returns:
+            (file_type, parsed transaction rows); file_type is None when the
+            file could not be classified
+        """
+        # Copy file to input directory
+        input_file = self.input_dir / Path(file_path).name
+        shutil.copy2(file_path, input_file)
+        
+        # Step 1: Classify the file type using analyze_csv_structure
+        file_type = analyze_csv_structure(str(input_file))
+        if not file_type:
+            return None, []
+        
+        # Move to working directory (where parser expects classified files)
+        working_dir = self.base_dir / "working"
+        working_dir.mkdir(parents=True, exist_ok=True)
+        classified_file = working_dir / f"{file_type}_{input_file.name}"
+        shutil.move(str(input_file), str(classified_file))
+        
+        # Step 2: Parse transactions from CSV
+        return file_type, parse_classified_files(str(self.base_dir))
+    
     async def _get_or_create_account(
         self,
         db: AsyncSession,
@@ -381,26 +407,34 @@ class TransactionPipeline:
         
         return category
     
-    async def _check_duplicate(
+    async def _load_transaction_keys(
         self,
         db: AsyncSession,
-        transaction_date: date,
-        amount: float,
-        description: str
-    ) -> bool:
-        """Check if a transaction already exists (duplicate detection)"""
+        start_date: date,
+        end_date: date
+    ) -> Set[int]:
+        """
+        Load transaction_key() hashes of existing transactions in a date
+        window, for in-memory duplicate detection
+        """
         result = await db.execute(
-            select(Transaction).where(
+            select(
+                Transaction.transaction_date,
+                Transaction.amount,
+                Transaction.description
+            ).where(
                 and_(
                     Transaction.user_id == SINGLE_USER_ID,
-                    Transaction.transaction_date == transaction_date,
-                    Transaction.amount == Decimal(str(abs(amount))),
-                    Transaction.description == description
+                    Transaction.transaction_date >= start_date,
+                    Transaction.transaction_date <= end_date
                 )
-            ).limit(1)
+            )
         )
         
-        return result.scalar_one_or_none() is not None
+        return {
+            transaction_key(transaction_date, amount, description)
+            for transaction_date, amount, description in result
+        }
     
     async def get_processing_stats(
         self,
@@ -15,8 +15,11 @@ class IntelligentTagger:
         # Exact mappings from manual tagging work
         self.exact_mappings = get_exact_mappings()
         
-        # Pattern-based mappings (regex patterns -> tag)
+        # Pattern-based mappings (regex patterns -> tag), compiled once
         self.pattern_mappings = get_pattern_mappings()
+        self.compiled_patterns = [
+            (re.compile(pattern, re.IGNORECASE), tag) for pattern, tag in self.pattern_mappings
+        ]
         
         # Tag statistics
         self.exact_matches = 0
@@ -67,14 +70,56 @@ class IntelligentTagger:
                 pass
             
         # 4. Try pattern matching
-        for pattern, tag in self.pattern_mappings:
-            if re.search(pattern, description, re.IGNORECASE):
-                self.pattern_matches += 1
-                return tag
+        tag = self.match_pattern(description)
+        if tag:
+            self.pattern_matches += 1
+            return tag
                 
         # 5. No match found
         self.untagged += 1
         return ''
+
+    def match_pattern(self, description):
+        """First pattern-mapping tag matching the description ('' if none)"""
+        for pattern, tag in self.compiled_patterns:
+            if pattern.search(description):
+                return tag
+        return ''
+
+    def tag_transactions(self, descriptions, amounts):
+        """
+        Tag a batch of transactions; same rules and statistics as calling
+        tag_transaction per row. The description-only lookups (exact,
+        similarity, patterns) run once per distinct description, so repeated
+        merchants in a statement cost a dict hit instead of a fuzzy scan.
+        """
+        lookups = {}
+        tags = []
+        for description, amount in zip(descriptions, amounts):
+            lookup = lookups.get(description)
+            if lookup is None:
+                mapped = self.exact_mappings.get(description) or self.find_similar_mapping(description)
+                lookup = lookups[description] = (
+                    mapped,
+                    None if mapped else self.match_pattern(description),
+                    "APPLE.COM" in description.upper()
+                )
+            mapped, pattern_tag, is_apple = lookup
+
+            if mapped:
+                self.exact_matches += 1
+                tags.append(mapped)
+            elif is_apple and abs(amount) > 100:
+                # Amount-based rule: Apple.com over $100 is IT Equipment
+                self.pattern_matches += 1
+                tags.append("IT Equipment")
+            elif pattern_tag:
+                self.pattern_matches += 1
+                tags.append(pattern_tag)
+            else:
+                self.untagged += 1
+                tags.append('')
+        return tags
     
     def process_master_file(self, input_file='output/Master_Transactions.csv', output_file='output/Master_Transactions_Tagged.csv'):
         """Process the master file and add tags"""
@@ -0,0 +1,118 @@
+"""
+Category list/stats cache: writes must evict what GET has cached
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
+
+from app.api.v1.banking import categories
+from app.api.v1.banking.categories import (
+    CATEGORIES_CACHE_NAMESPACE,
+    CATEGORY_STATS_CACHE_NAMESPACE,
+    categories_key_builder,
+    category_stats_key_builder,
+    invalidate_category_cache,
+)
+
+USER = SimpleNamespace(id=1)
+
+
+@pytest.fixture(autouse=True)
+def cache_backend(monkeypatch):
+    """Empty caches and a finance data version the test controls"""
+    InMemoryBackend._store.clear()
+    categories._categories_local_cache.clear()
+    FastAPICache.init(InMemoryBackend(), prefix="test")
+    data_version = SimpleNamespace(value=1)
+
+    monkeypatch.setattr(categories, "current_finance_data_version", lambda: data_version.value)
+    return data_version
+
+
+def make_list_categories(names):
+    """Cached stand-in for get_categories, reading names instead of the table"""
+    @cache(expire=60, namespace=CATEGORIES_CACHE_NAMESPACE, key_builder=categories_key_builder)
+    async def list_categories(current_user=None, category_type=None, search=None, limit=100, cursor=None):
+        return list(names)
+    return list_categories
+
+
+def test_keys_carry_cache_prefix():
+    kwargs = {"current_user": USER, "limit": 100}
+    list_key = categories_key_builder(None, CATEGORIES_CACHE_NAMESPACE, kwargs=kwargs)
+    stats_key = category_stats_key_builder(None, CATEGORY_STATS_CACHE_NAMESPACE, kwargs=kwargs)
+    assert list_key.startswith(f"test:{CATEGORIES_CACHE_NAMESPACE}:")
+    assert stats_key.startswith(f"test:{CATEGORY_STATS_CACHE_NAMESPACE}:")
+
+
+def test_write_then_get_sees_new_category():
+    names = ["Groceries"]
+    list_categories = make_list_categories(names)
+
+    async def scenario():
+        assert await list_categories(current_user=USER) == ["Groceries"]
+
+        # Served from the cache until something invalidates it
+        names.append("Travel")
+        assert await list_categories(current_user=USER) == ["Groceries"]
+
+        # What create_category/update_category do after committing
+        await invalidate_category_cache()
+        assert await list_categories(current_user=USER) == ["Groceries", "Travel"]
+
+    asyncio.run(scenario())
+
+
+def test_data_version_bump_skips_stale_entry(cache_backend):
+    names = ["Groceries"]
+    list_categories = make_list_categories(names)
+
+    async def scenario():
+        assert await list_categories(current_user=USER) == ["Groceries"]
+
+        # A write that never calls the invalidator (e.g. a settings tag
+        # edit); its NOTIFY still moves the finance data version
+        names.append("Travel")
+        cache_backend.value += 1
+        assert await list_categories(current_user=USER) == ["Groceries", "Travel"]
+
+    asyncio.run(scenario())
+
+
+def test_local_cache_follows_data_version(cache_backend):
+    # Another worker's write: this process never ran the invalidator
+    names = ["Groceries"]
+    list_categories = categories.local_categories_cache(make_list_categories(names))
+
+    async def scenario():
+        first = await list_categories(current_user=USER)
+        assert first.body == b'["Groceries"]'
+
+        names.append("Travel")
+        cache_backend.value += 1
+        second = await list_categories(current_user=USER)
+        assert second.body == b'["Groceries","Travel"]'
+
+    asyncio.run(scenario())
+
+
+def test_local_cache_reads_data_version_once(cache_backend, monkeypatch):
+    # The Redis key must use the version the L1 key was built from, even if
+    # a bump lands mid-request
+    reads = []
+
+    def current_finance_data_version():
+        reads.append(cache_backend.value)
+        cache_backend.value += 1
+        return reads[-1]
+
+    monkeypatch.setattr(categories, "current_finance_data_version", current_finance_data_version)
+    list_categories = categories.local_categories_cache(make_list_categories(["Groceries"]))
+
+    asyncio.run(list_categories(current_user=USER))
+    assert reads == [1]
+    assert any(key.endswith(":1") for key in InMemoryBackend._store)
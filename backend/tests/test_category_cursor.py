@@ -0,0 +1,29 @@
+"""
+Category list keyset cursor: (name, id) round trip
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.banking.categories import category_cursor, parse_category_cursor
+
+
+def test_cursor_round_trip_keeps_id_for_duplicate_names():
+    first = category_cursor(SimpleNamespace(id=7, name="Dining"))
+    second = category_cursor(SimpleNamespace(id=12, name="Dining"))
+    assert first != second
+    assert parse_category_cursor(first) == ("Dining", 7)
+    assert parse_category_cursor(second) == ("Dining", 12)
+
+
+def test_cursor_name_may_contain_separator():
+    cursor = category_cursor(SimpleNamespace(id=3, name="Travel: Air"))
+    assert parse_category_cursor(cursor) == ("Travel: Air", 3)
+
+
+@pytest.mark.parametrize("cursor", ["Dining", "abc:Dining", ":Dining"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_category_cursor(cursor)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,52 @@
+"""
+Finance data version: one shared bump per committed change
+"""
+import asyncio
+
+import pytest
+
+from app.core import data_version
+
+
+class FakeRedis:
+    def __init__(self):
+        self.counter = 0
+        self.seen = set()
+
+    async def eval(self, script, numkeys, version_key, seen_key, ttl):
+        if seen_key not in self.seen:
+            self.seen.add(seen_key)
+            self.counter += 1
+        return self.counter
+
+
+class BrokenRedis:
+    async def eval(self, *args):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture(autouse=True)
+def reset_version(monkeypatch):
+    monkeypatch.setattr(data_version, "_version", 0)
+
+
+def test_same_change_bumps_shared_version_once():
+    redis = FakeRedis()
+    asyncio.run(data_version.apply_finance_data_change(redis, "100"))
+    asyncio.run(data_version.apply_finance_data_change(redis, "100"))
+    assert redis.counter == 1
+    assert data_version.current_finance_data_version() == 1
+
+    asyncio.run(data_version.apply_finance_data_change(redis, "101"))
+    assert data_version.current_finance_data_version() == 2
+
+
+def test_redis_failure_still_moves_local_version():
+    asyncio.run(data_version.apply_finance_data_change(BrokenRedis(), "100"))
+    assert data_version.current_finance_data_version() == 1
+
+
+def test_version_never_moves_backwards(monkeypatch):
+    monkeypatch.setattr(data_version, "_version", 5)
+    asyncio.run(data_version.apply_finance_data_change(FakeRedis(), "100"))
+    assert data_version.current_finance_data_version() == 5
@@ -0,0 +1,92 @@
+"""
+Dashboard result shaping: the single aggregate row -> response body
+"""
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from app.api.v1.banking import finance
+
+CATEGORIES = [{"name": "Groceries", "amount": 250.5, "count": 4}]
+RECENT = [{
+    "id": 9, "date": "2024-03-14", "description": "MARKET", "amount": 62.25,
+    "type": "debit", "category": "Groceries"
+}]
+
+
+def dashboard_row(**overrides):
+    """Row as the asyncpg dialect returns it: json columns already decoded"""
+    row = dict(
+        total_balance=1200.0,
+        account_count=2,
+        total_income=3000.0,
+        total_expenses=1500.0,
+        transaction_count=12,
+        first_transaction=date(2024, 3, 1),
+        last_transaction=date(2024, 3, 31),
+        categories=CATEGORIES,
+        recent_transactions=RECENT
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class FakeResult:
+    """Stands in for the buffered Result execute_in_new_session returns"""
+
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+    def scalar(self):
+        return 1
+
+
+def test_decoded_json_lists_pass_through():
+    body = finance.build_dashboard_response(
+        dashboard_row(), "this_month", date(2024, 3, 1), date(2024, 3, 31)
+    )["data"]
+    assert body["categories"] == CATEGORIES
+    assert body["recent_transactions"] == RECENT
+    assert body["summary"]["balance"] == 1500.0
+    assert body["summary"]["savings_rate"] == 50.0
+    assert body["quick_stats"]["transactions_this_period"] == 12
+    assert body["quick_stats"]["data_start_date"] == "2024-03-01"
+
+
+def test_empty_period():
+    body = finance.build_dashboard_response(
+        dashboard_row(
+            total_income=None, total_expenses=None, transaction_count=None,
+            first_transaction=None, last_transaction=None,
+            categories=None, recent_transactions=[]
+        ),
+        "all_time", None, None
+    )["data"]
+    assert body["categories"] == []
+    assert body["recent_transactions"] == []
+    assert body["summary"]["savings_rate"] == 0
+    assert body["quick_stats"]["average_monthly_spending"] == 0.0
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    InMemoryBackend._store.clear()
+    FastAPICache.init(InMemoryBackend(), prefix="test")
+
+    async def execute_in_new_session(statement):
+        return FakeResult(dashboard_row())
+
+    monkeypatch.setattr(finance, "execute_in_new_session", execute_in_new_session)
+
+
+def test_handler_returns_decoded_lists(fake_db):
+    response = asyncio.run(finance.get_dashboard_metrics(period="all_time", start_date=None, end_date=None))
+    assert response["data"]["categories"] == CATEGORIES
+    assert response["data"]["recent_transactions"] == RECENT
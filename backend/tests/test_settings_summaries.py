@@ -0,0 +1,56 @@
+"""
+Settings JSON summaries: json_agg results arrive decoded from the driver
+"""
+import asyncio
+
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from app.api.v1.banking import settings
+
+TAGS = [{"tag_name": "Groceries", "record_count": 4}, {"tag_name": "Uncategorized", "record_count": 1}]
+RANGES = [{
+    "account_name": "Checking", "earliest_date": "2024-01-02",
+    "latest_date": "2024-03-14", "transaction_count": 5
+}]
+
+
+class FakeSession:
+    """AsyncSession stand-in: execute() yields the decoded json_agg value"""
+
+    def __init__(self, value):
+        self.value = value
+
+    async def execute(self, statement, params=None):
+        return self
+
+    def scalar(self):
+        return self.value
+
+
+@pytest.fixture(autouse=True)
+def cache_backend(monkeypatch):
+    InMemoryBackend._store.clear()
+    FastAPICache.init(InMemoryBackend(), prefix="test")
+
+    monkeypatch.setattr(settings, "current_finance_data_version", lambda: 1)
+
+
+def test_tags_summary_returns_decoded_list():
+    response = asyncio.run(settings.get_tags_summary(db=FakeSession(TAGS), user_id=1))
+    assert response["data"] == {"tags": TAGS, "total_tags": 2}
+
+
+def test_date_ranges_returns_decoded_list():
+    response = asyncio.run(settings.get_transaction_date_ranges(db=FakeSession(RANGES), user_id=1))
+    assert response["data"] == {"account_ranges": RANGES}
+
+
+def test_summaries_are_cached_per_user():
+    asyncio.run(settings.get_tags_summary(db=FakeSession(TAGS), user_id=1))
+    other = asyncio.run(settings.get_tags_summary(db=FakeSession([]), user_id=2))
+    assert other["data"] == {"tags": [], "total_tags": 0}
+
+    key = settings.settings_key_builder(settings.get_tags_summary, settings.SETTINGS_CACHE_NAMESPACE, kwargs={"user_id": 2})
+    assert key.startswith(f"test:{settings.SETTINGS_CACHE_NAMESPACE}:summary:2:")
@@ -0,0 +1,45 @@
+"""
+Upload storage: a returned file_id must be findable from any worker
+"""
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.api.v1.banking import process
+
+CSV_BODY = b"Date,Description,Amount\n03/14/2024,MARKET,-62.25\n"
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(process, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(process, "uploaded_files", {})
+    return tmp_path
+
+
+def test_upload_is_on_disk_when_file_id_is_returned(upload_dir):
+    file = UploadFile(io.BytesIO(CSV_BODY), filename="stmt.csv", headers={"content-type": "text/csv"})
+    response = asyncio.run(process.upload_file(file=file))
+
+    # Another worker: empty index, so the lookup falls back to the directory
+    process.uploaded_files.clear()
+    file_path = process.find_upload(response["file_id"])
+    assert file_path is not None
+    assert file_path.read_bytes() == CSV_BODY
+    assert response["file_size"] == len(CSV_BODY)
+    assert not list(upload_dir.glob("*.part"))
+
+
+def test_partial_write_is_not_found(upload_dir):
+    (upload_dir / "20240314_120000_abc_stmt.csv.part").write_bytes(CSV_BODY[:10])
+    assert process.find_upload("abc") is None
+
+
+def test_failed_open_raises_original_error(upload_dir):
+    file = UploadFile(io.BytesIO(CSV_BODY), filename="stmt.csv")
+    with pytest.raises(FileNotFoundError) as excinfo:
+        asyncio.run(process.save_upload(file, upload_dir / "missing" / "stmt.csv"))
+    # The open() failure itself, not a second error from the .part cleanup
+    assert excinfo.value.__context__ is None
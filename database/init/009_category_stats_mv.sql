@@ -0,0 +1,69 @@
+-- Migration: Materialized per-category transaction stats
+-- Backs GET /api/v1/banking/categories/stats/summary so the endpoint no longer
+-- joins and aggregates the whole transactions table on every request.
+--
+-- Refresh is debounced: writes to transactions/categories only flag the view
+-- as stale (statement-level trigger), and the next read through
+-- category_stats_fresh() refreshes it once.
+--
+-- Note: the flag below can lose writes (a writer that finds it already set
+-- takes no row lock, so a concurrent clear+refresh misses its rows).
+-- 019 replaces it with stale_seq/refreshed_seq counters.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS category_stats_mv AS
+SELECT
+    c.id,
+    c.name,
+    c.category_type,
+    COUNT(t.id) AS transaction_count,
+    SUM(t.amount) AS total_amount
+FROM categories c
+LEFT JOIN transactions t ON t.category_id = c.id
+WHERE c.is_active
+GROUP BY c.id, c.name, c.category_type;
+
+-- Unique index allows REFRESH ... CONCURRENTLY (readers are never blocked)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_category_stats_mv_id ON category_stats_mv(id);
+
+-- Single-row staleness flag
+CREATE TABLE IF NOT EXISTS category_stats_mv_state (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    is_stale BOOLEAN NOT NULL DEFAULT false
+);
+INSERT INTO category_stats_mv_state (id, is_stale) VALUES (1, false)
+ON CONFLICT (id) DO NOTHING;
+
+-- Mark the view stale; fires once per statement, not per row
+CREATE OR REPLACE FUNCTION mark_category_stats_stale()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE category_stats_mv_state SET is_stale = true WHERE id = 1 AND NOT is_stale;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_transactions_category_stats_stale ON transactions;
+CREATE TRIGGER trigger_transactions_category_stats_stale
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_category_stats_stale();
+
+DROP TRIGGER IF EXISTS trigger_categories_category_stats_stale ON categories;
+CREATE TRIGGER trigger_categories_category_stats_stale
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_category_stats_stale();
+
+-- Read entry point: refresh if stale, then return the view rows
+CREATE OR REPLACE FUNCTION category_stats_fresh()
+RETURNS SETOF category_stats_mv AS $$
+BEGIN
+    IF (SELECT is_stale FROM category_stats_mv_state WHERE id = 1) THEN
+        -- Clear the flag first. Only waits for in-flight writers that set
+        -- the flag themselves; see 019
+        UPDATE category_stats_mv_state SET is_stale = false WHERE id = 1;
+        REFRESH MATERIALIZED VIEW CONCURRENTLY category_stats_mv;
+    END IF;
+    RETURN QUERY SELECT * FROM category_stats_mv;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,14 @@
+-- Migration: Composite indexes for account/category list filters
+-- Every banking endpoint filters accounts by user_id (and usually is_active);
+-- category lists filter on is_active and ORDER BY name.
+-- CONCURRENTLY keeps existing databases writable while the index builds.
+
+-- Covering index: the account list/summary queries become index-only scans
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_accounts_user_active
+    ON accounts(user_id, is_active)
+    INCLUDE (id, name, account_type, balance);
+
+-- Active categories in name order, without a Sort node
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_categories_active_name
+    ON categories(name)
+    WHERE is_active;
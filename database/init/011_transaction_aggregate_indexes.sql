@@ -0,0 +1,14 @@
+-- Migration: Covering indexes for finance dashboard aggregates
+-- The dashboard, transactions summary and cumulative-spending queries filter
+-- on user_id (equality) and a transaction_date range, then aggregate amount
+-- by transaction_type. Column order follows equality -> range -> grouping,
+-- and INCLUDE makes the aggregates index-only scans.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_date_type
+    ON transactions(user_id, transaction_date, transaction_type)
+    INCLUDE (amount, category_id);
+
+-- Budget category analysis: per-category debit totals over a date range
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_category_date_type
+    ON transactions(user_id, category_id, transaction_date, transaction_type)
+    INCLUDE (amount);
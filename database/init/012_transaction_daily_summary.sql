@@ -0,0 +1,117 @@
+-- Migration: Per-day transaction rollup maintained by triggers
+-- Dashboard, transactions-summary and budget-analysis totals read this table
+-- instead of scanning every transaction in the period: one row per
+-- (user, day, category) instead of one per transaction.
+--
+-- category_id 0 = uncategorized (keeps the primary key NOT NULL)
+
+CREATE TABLE IF NOT EXISTS transaction_daily_summary (
+    user_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    category_id INTEGER NOT NULL DEFAULT 0,
+    credit_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    debit_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    debit_abs_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    tx_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day, category_id)
+);
+
+-- Statement-level triggers with transition tables: a bulk write of N rows
+-- costs one grouped upsert, not N row triggers. One function serves INSERT,
+-- UPDATE and DELETE; plpgsql plans each statement on first execution, so a
+-- branch naming a transition table the trigger does not expose never runs.
+CREATE OR REPLACE FUNCTION transaction_daily_summary_sync()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Retract deleted rows / pre-update values
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE transaction_daily_summary AS s SET
+            credit_sum = s.credit_sum - d.credit_sum,
+            debit_sum = s.debit_sum - d.debit_sum,
+            debit_abs_sum = s.debit_abs_sum - d.debit_abs_sum,
+            tx_count = s.tx_count - d.tx_count
+        FROM (
+            SELECT user_id, transaction_date AS day, COALESCE(category_id, 0) AS category_id,
+                   SUM(CASE WHEN transaction_type = 'credit' THEN amount ELSE 0 END) AS credit_sum,
+                   SUM(CASE WHEN transaction_type = 'debit' THEN amount ELSE 0 END) AS debit_sum,
+                   SUM(CASE WHEN transaction_type = 'debit' THEN ABS(amount) ELSE 0 END) AS debit_abs_sum,
+                   COUNT(*) AS tx_count
+            FROM old_rows
+            GROUP BY user_id, transaction_date, COALESCE(category_id, 0)
+        ) AS d
+        WHERE s.user_id = d.user_id AND s.day = d.day AND s.category_id = d.category_id;
+    END IF;
+
+    -- Apply inserted rows / post-update values
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO transaction_daily_summary AS s
+            (user_id, day, category_id, credit_sum, debit_sum, debit_abs_sum, tx_count)
+        SELECT user_id, transaction_date, COALESCE(category_id, 0),
+               SUM(CASE WHEN transaction_type = 'credit' THEN amount ELSE 0 END),
+               SUM(CASE WHEN transaction_type = 'debit' THEN amount ELSE 0 END),
+               SUM(CASE WHEN transaction_type = 'debit' THEN ABS(amount) ELSE 0 END),
+               COUNT(*)
+        FROM new_rows
+        GROUP BY user_id, transaction_date, COALESCE(category_id, 0)
+        ON CONFLICT (user_id, day, category_id) DO UPDATE SET
+            credit_sum = s.credit_sum + EXCLUDED.credit_sum,
+            debit_sum = s.debit_sum + EXCLUDED.debit_sum,
+            debit_abs_sum = s.debit_abs_sum + EXCLUDED.debit_abs_sum,
+            tx_count = s.tx_count + EXCLUDED.tx_count;
+    END IF;
+
+    -- Drop buckets that no longer hold any transaction
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM transaction_daily_summary WHERE tx_count <= 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_transactions_daily_summary_insert ON transactions;
+CREATE TRIGGER trigger_transactions_daily_summary_insert
+    AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION transaction_daily_summary_sync();
+
+DROP TRIGGER IF EXISTS trigger_transactions_daily_summary_update ON transactions;
+CREATE TRIGGER trigger_transactions_daily_summary_update
+    AFTER UPDATE ON transactions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION transaction_daily_summary_sync();
+
+DROP TRIGGER IF EXISTS trigger_transactions_daily_summary_delete ON transactions;
+CREATE TRIGGER trigger_transactions_daily_summary_delete
+    AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION transaction_daily_summary_sync();
+
+CREATE OR REPLACE FUNCTION transaction_daily_summary_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE transaction_daily_summary;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_transactions_daily_summary_truncate ON transactions;
+CREATE TRIGGER trigger_transactions_daily_summary_truncate
+    AFTER TRUNCATE ON transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION transaction_daily_summary_truncate();
+
+-- Backfill for databases that already hold transactions
+INSERT INTO transaction_daily_summary
+    (user_id, day, category_id, credit_sum, debit_sum, debit_abs_sum, tx_count)
+SELECT user_id, transaction_date, COALESCE(category_id, 0),
+       SUM(CASE WHEN transaction_type = 'credit' THEN amount ELSE 0 END),
+       SUM(CASE WHEN transaction_type = 'debit' THEN amount ELSE 0 END),
+       SUM(CASE WHEN transaction_type = 'debit' THEN ABS(amount) ELSE 0 END),
+       COUNT(*)
+FROM transactions
+GROUP BY user_id, transaction_date, COALESCE(category_id, 0)
+ON CONFLICT (user_id, day, category_id) DO NOTHING;
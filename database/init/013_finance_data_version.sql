@@ -0,0 +1,38 @@
+-- Migration: Finance data version counter
+-- Bumped by a statement-level trigger on every write to the tables behind the
+-- finance endpoints. Response cache keys embed the current version, so any
+-- write makes earlier cached dashboards unreachable without explicit purges.
+
+CREATE TABLE IF NOT EXISTS finance_data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO finance_data_version (id, version) VALUES (1, 0)
+ON CONFLICT (id) DO NOTHING;
+
+-- Fires once per statement, not per row
+CREATE OR REPLACE FUNCTION bump_finance_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE finance_data_version SET version = version + 1 WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_transactions_finance_data_version ON transactions;
+CREATE TRIGGER trigger_transactions_finance_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_finance_data_version();
+
+DROP TRIGGER IF EXISTS trigger_categories_finance_data_version ON categories;
+CREATE TRIGGER trigger_categories_finance_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_finance_data_version();
+
+DROP TRIGGER IF EXISTS trigger_accounts_finance_data_version ON accounts;
+CREATE TRIGGER trigger_accounts_finance_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON accounts
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_finance_data_version();
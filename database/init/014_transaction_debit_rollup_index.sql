@@ -0,0 +1,19 @@
+-- Migration: Covering partial index for debit category rollups
+-- Dashboard top spending categories: debits only, user_id equality plus a
+-- transaction_date range, grouped by category and summing amount. The
+-- partial predicate keeps credits out of the index, and INCLUDE makes the
+-- rollup an index-only scan. (Budget analysis reads transaction_daily_summary.)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_debit_user_date
+    ON transactions(user_id, transaction_date)
+    INCLUDE (category_id, amount)
+    WHERE transaction_type = 'debit';
+
+-- Index-only scans skip the heap only for pages marked all-visible, so
+-- vacuum transactions after ~2% of rows change or are inserted instead of
+-- the 20% default
+ALTER TABLE transactions SET (
+    autovacuum_vacuum_scale_factor = 0.02,
+    autovacuum_vacuum_insert_scale_factor = 0.02,
+    autovacuum_analyze_scale_factor = 0.02
+);
@@ -0,0 +1,9 @@
+-- Migration: Partial index for same-day double-charge detection
+-- GET /api/v1/banking/transactions/double-charges groups a user's debits by
+-- (transaction_date, lower(description), amount). Indexing that expression
+-- in the same order lets Postgres feed the window partition from the index
+-- instead of sorting every debit the user has.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_debit_double_charge
+    ON transactions(user_id, transaction_date, lower(description), amount)
+    WHERE transaction_type = 'debit';
@@ -0,0 +1,9 @@
+-- Migration: Keyset index for the paged account list
+-- GET /api/v1/banking/accounts/ filters on user_id, seeks with id > cursor
+-- and orders by id. With (user_id, id) each page is an index range scan
+-- that stops after LIMIT rows, with no Sort node; INCLUDE carries the
+-- projected columns so the page is an index-only scan.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_accounts_user_id_keyset
+    ON accounts(user_id, id)
+    INCLUDE (name, account_type, balance, is_active);
@@ -0,0 +1,11 @@
+-- Migration: Keyset index for the paged category list
+-- Category names are not unique, so GET /api/v1/banking/categories/ pages on
+-- (name, id): WHERE (name, id) > (cursor_name, cursor_id) ORDER BY name, id.
+-- Replaces the name-only partial index from 010, which cannot serve the
+-- tie-breaking id without an extra sort.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_categories_active_name_id
+    ON categories(name, id)
+    WHERE is_active;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_categories_active_name;
@@ -0,0 +1,20 @@
+-- Migration: Announce finance data writes with NOTIFY instead of a counter row
+-- 013 bumped a single-row counter inside every write statement, so the row
+-- lock was held until the writer committed: a long import (one transaction)
+-- blocked every other writer's first statement on the same row.
+--
+-- The trigger now only sends NOTIFY finance_data_changed with the writing
+-- transaction's id. NOTIFY takes no row lock, is delivered only on commit
+-- (never for rolled-back writes), and repeated identical notifications in one
+-- transaction are collapsed. Each API worker LISTENs and keeps the cache-key
+-- version in Redis (app/core/data_version.py).
+
+CREATE OR REPLACE FUNCTION bump_finance_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('finance_data_changed', txid_current()::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TABLE IF EXISTS finance_data_version;
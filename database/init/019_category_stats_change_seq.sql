@@ -0,0 +1,48 @@
+-- Migration: Track category_stats_mv staleness with sequence numbers
+-- 009's trigger only wrote the state row when the flag was clear
+-- (WHERE NOT is_stale). A writer that found it already set took no row lock,
+-- so a reader clearing the flag did not wait for it: the refresh missed the
+-- writer's rows and nothing re-flagged the view once the writer committed.
+--
+-- Writers now always bump stale_seq, so they always take the row lock and
+-- only ever move the counter forward. A read records the stale_seq it saw
+-- before refreshing as refreshed_seq; any write committed after that read
+-- leaves stale_seq > refreshed_seq and the next read refreshes again.
+
+ALTER TABLE category_stats_mv_state
+    ADD COLUMN IF NOT EXISTS stale_seq BIGINT NOT NULL DEFAULT 1,
+    ADD COLUMN IF NOT EXISTS refreshed_seq BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE category_stats_mv_state DROP COLUMN IF EXISTS is_stale;
+
+-- Record a change; fires once per statement, not per row
+CREATE OR REPLACE FUNCTION mark_category_stats_stale()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE category_stats_mv_state SET stale_seq = stale_seq + 1 WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Read entry point: refresh if a change is newer than the last refresh,
+-- then return the view rows
+CREATE OR REPLACE FUNCTION category_stats_fresh()
+RETURNS SETOF category_stats_mv AS $$
+DECLARE
+    seen_seq BIGINT;
+BEGIN
+    SELECT stale_seq INTO seen_seq
+    FROM category_stats_mv_state
+    WHERE id = 1 AND stale_seq > refreshed_seq;
+
+    IF FOUND THEN
+        -- The refresh starts after seen_seq was read, so it sees every write
+        -- counted in it; later writers push stale_seq past seen_seq
+        REFRESH MATERIALIZED VIEW CONCURRENTLY category_stats_mv;
+        UPDATE category_stats_mv_state
+        SET refreshed_seq = GREATEST(refreshed_seq, seen_seq)
+        WHERE id = 1;
+    END IF;
+    RETURN QUERY SELECT * FROM category_stats_mv;
+END;
+$$ LANGUAGE plpgsql;